@@ -1,17 +1,21 @@
 # app.py - Main Streamlit Application
 import streamlit as st
 import os
+import time
 import uuid
 from datetime import datetime
-from groq import Groq
 import json
 from typing import Dict, List, Any, Optional
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
-from langchain_core.runnables import RunnableSequence, RunnableLambda
-from langchain_core.output_parsers import StrOutputParser
 from dotenv import load_dotenv
+from topic_tracker import DEFAULT_TAXONOMY, TopicMatcher, TopicProfile, load_taxonomy, update_context
 
-load_dotenv()
+@st.cache_resource
+def load_environment() -> None:
+    """Load .env once per process rather than on every rerun."""
+    load_dotenv()
+
+load_environment()
 
 # Configure page
 st.set_page_config(
@@ -24,10 +28,6 @@ st.set_page_config(
 # Initialize session state variables
 if "user_id" not in st.session_state:
     st.session_state.user_id = str(uuid.uuid4())
-if "advisor_chat_history" not in st.session_state:
-    st.session_state.advisor_chat_history = []
-if "partner_chat_history" not in st.session_state:
-    st.session_state.partner_chat_history = []
 if "chat_mode" not in st.session_state:
     st.session_state.chat_mode = "advisor"  # Can be "advisor" or "partner"
 if "profile" not in st.session_state:
@@ -54,27 +54,64 @@ if "conversation_context" not in st.session_state:
     st.session_state.conversation_context = {
         "last_date_discussed": None,
         "last_match_suggested": None,
-        "recent_topics": [],
+        "recent_topics": [],  # most discussed first across both modes, see topic_tracker
+        "topic_scores": {},
         "conversation_style": "casual",
         "role_playing": False  # Track if we're in role-playing mode
     }
+if "profile_version" not in st.session_state:
+    st.session_state.profile_version = 0  # bumped on every profile save
 if "current_tab" not in st.session_state:
     st.session_state.current_tab = "home"
 
-# Define LangGraph state schema
-class ChatState(dict):
-    """Chat state schema for LangGraph."""
-    messages: List[Dict[str, Any]]
-    context: Dict[str, Any]
-    user_id: str
+class Conversation:
+    """A chat kept in both LLM-ready and display form, one turn at a time.
+
+    `messages` is the list sent to the model, system prompt included;
+    `history` holds the same turns as LangChain messages for display.
+    Each turn is appended to both, so nothing is rebuilt per message.
+    """
+    
+    def __init__(self, mode: str, context: Dict[str, Any]):
+        self.mode = mode
+        self.messages: List[Dict[str, str]] = [{"role": "system", "content": ""}]
+        self.history: List[Any] = []
+        self.context = context
+        self.prompt_version: Optional[int] = None
+        self.topics = TopicProfile()
+    
+    def sync_system_prompt(self, profile: Dict[str, Any], profile_version: int) -> None:
+        """Recompile the system prompt if the profile changed since it was built.
+
+        Between profile saves the prompt is reused as is, so every turn
+        sends the same prefix and upstream prompt caching can hit.
+        """
+        if self.prompt_version != profile_version:
+            self.messages[0] = {"role": "system", "content": compile_system_prompt(self.mode, profile)}
+            self.prompt_version = profile_version
+    
+    def add_user_message(self, content: str) -> None:
+        self.messages.append({"role": "user", "content": content})
+        self.history.append(HumanMessage(content=content))
+    
+    def add_assistant_message(self, content: str) -> None:
+        self.messages.append({"role": "assistant", "content": content})
+        self.history.append(AIMessage(content=content))
+
+# Initialize Groq client. One client per API key is shared by all sessions,
+# so its connection pool stays warm across messages.
+@st.cache_resource
+def create_groq_client(api_key: str):
+    # Imported on first use so page loads that never call the LLM skip it
+    from groq import Groq
+    return Groq(api_key=api_key)
 
-# Initialize Groq client
 def get_groq_client():
     api_key = os.getenv("GROQ_API_KEY")
     if not api_key:
         st.error("GROQ_API_KEY not found in environment variables.")
         st.stop()
-    return Groq(api_key=api_key)
+    return create_groq_client(api_key)
 
 # System prompts
 DATING_ADVISOR_PROMPT = """
@@ -148,90 +185,120 @@ Remember to:
 - Balance playfulness with sincerity to create an authentic connection
 """
 
-def initialize_state(user_id: str) -> ChatState:
-    """Initialize the chat state."""
-    prompt = ONLINE_PARTNER_PROMPT if st.session_state.chat_mode == "partner" else DATING_ADVISOR_PROMPT
-    return ChatState(
-        messages=[{"role": "system", "content": prompt}],
-        context=st.session_state.conversation_context,
-        user_id=user_id
-    )
-
-# Initialize Groq client
-def get_groq_client():
-    api_key = os.getenv("GROQ_API_KEY")
-    if not api_key:
-        st.error("GROQ_API_KEY not found in environment variables.")
-        st.stop()
-    return Groq(api_key=api_key)
+BASE_PROMPTS = {"advisor": DATING_ADVISOR_PROMPT, "partner": ONLINE_PARTNER_PROMPT}
+
+# Profile fields included in the system prompt, in a fixed order
+PROMPT_PROFILE_FIELDS = [
+    ("name", "Name"),
+    ("age", "Age"),
+    ("gender", "Gender"),
+    ("location", "Location"),
+    ("occupation", "Occupation"),
+    ("education", "Education"),
+    ("languages", "Languages"),
+    ("interested_in", "Interested in"),
+    ("relationship_goals", "Relationship goals"),
+    ("hobbies", "Hobbies"),
+    ("personality_traits", "Personality"),
+    ("love_language", "Love language"),
+    ("communication_style", "Communication style"),
+    ("values", "Values"),
+    ("life_goals", "Life goals"),
+    ("ideal_partner_traits", "Wants in a partner"),
+    ("deal_breakers", "Deal breakers"),
+]
+
+def compile_system_prompt(mode: str, profile: Dict[str, Any]) -> str:
+    """Render the system prompt for a chat mode, personalized with the user's profile.
+
+    Output depends only on its inputs: indentation is stripped, fields
+    come in a fixed order and empty fields are left out.
+    """
+    lines = [line.strip() for line in BASE_PROMPTS[mode].strip().splitlines()]
+    prompt = "\n".join(line for line in lines if line)
+    
+    details = []
+    for field, label in PROMPT_PROFILE_FIELDS:
+        value = profile.get(field)
+        if isinstance(value, list):
+            value = ", ".join(value)
+        if value:
+            details.append(f"{label}: {value}")
+    if details:
+        prompt += "\n\nUser profile:\n" + "\n".join(details)
+    return prompt
+
+# The topic automaton is built once per process; TOPIC_TAXONOMY_PATH can
+# point at a JSON {topic: [keywords]} file to replace the default taxonomy.
+@st.cache_resource
+def get_topic_matcher() -> TopicMatcher:
+    path = os.getenv("TOPIC_TAXONOMY_PATH")
+    return TopicMatcher(load_taxonomy(path) if path else DEFAULT_TAXONOMY)
+
+def get_conversation(mode: str) -> Conversation:
+    """Get this session's conversation for a chat mode."""
+    return st.session_state.conversations[mode]
+
+if "conversations" not in st.session_state:
+    st.session_state.conversations = {
+        "advisor": Conversation("advisor", st.session_state.conversation_context),
+        "partner": Conversation("partner", st.session_state.conversation_context),
+    }
 
-# LangGraph functions
-def initialize_state(user_id: str) -> ChatState:
-    """Initialize the chat state."""
-    prompt = ONLINE_PARTNER_PROMPT if st.session_state.chat_mode == "partner" else DATING_ADVISOR_PROMPT
-    return ChatState(
-        messages=[{"role": "system", "content": prompt}],
-        context=st.session_state.conversation_context,
-        user_id=user_id
-    )
 
 # Define chain components
 def build_chat_chain():
+    from langchain_core.runnables import RunnableSequence, RunnableLambda
+    
     def add_message_to_state(inputs: dict) -> dict:
-        state = inputs["state"]
+        conversation = inputs["conversation"]
         message = inputs["message"]
-        state["messages"].append({"role": "user", "content": message})
+        conversation.sync_system_prompt(st.session_state.profile, st.session_state.profile_version)
+        conversation.add_user_message(message)
         
-        # Update context with simple topic tracking
-        if "recent_topics" in state["context"]:
-            potential_topics = ["date", "match", "profile", "advice", "relationship"]
-            for topic in potential_topics:
-                if topic in message.lower() and len(state["context"]["recent_topics"]) < 5:
-                    if topic not in state["context"]["recent_topics"]:
-                        state["context"]["recent_topics"].append(topic)
+        # Update the decayed topic profile; both modes share the context,
+        # so it gets their merged topics
+        others = [c.topics for c in st.session_state.conversations.values() if c is not conversation]
+        update_context(conversation.context, get_topic_matcher(), conversation.topics, message, others=others)
         
-        return {"state": state}
+        return inputs
 
     def generate_response(inputs: dict) -> dict:
-        state = inputs["state"]
+        """Get the assistant reply, streaming it to on_token if one is given."""
+        conversation = inputs["conversation"]
+        on_token = inputs.get("on_token")
         client = get_groq_client()
         
         try:
+            # The conversation's own message list is sent as is, not copied
             response = client.chat.completions.create(
-                messages=state["messages"],
+                messages=conversation.messages,
                 model="llama-3.3-70b-versatile",
                 max_tokens=1024,
-                temperature=0.7
+                temperature=0.7,
+                stream=on_token is not None
             )
-            assistant_message = response.choices[0].message.content
-            state["messages"].append({"role": "assistant", "content": assistant_message})
+            if on_token is None:
+                assistant_message = response.choices[0].message.content
+            else:
+                parts = []
+                for chunk in response:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        parts.append(delta)
+                        on_token(delta)
+                assistant_message = "".join(parts)
         except Exception as e:
             st.error(f"Error generating response: {str(e)}")
-            state["messages"].append({"role": "assistant", "content": "I'm having trouble connecting right now. Please try again in a moment."})
+            assistant_message = "I'm having trouble connecting right now. Please try again in a moment."
         
-        return {"state": state}
+        inputs["reply"] = assistant_message
+        return inputs
 
     def save_to_session(inputs: dict) -> dict:
-        """Modified save_to_session function to handle separate chat histories."""
-        state = inputs["state"]
-        # Convert messages to proper format for display
-        history = []
-        for msg in state["messages"]:
-            if msg["role"] == "user":
-                history.append(HumanMessage(content=msg["content"]))
-            elif msg["role"] == "assistant":
-                history.append(AIMessage(content=msg["content"]))
-        
-        # Update the appropriate chat history based on mode
-        if st.session_state.chat_mode == "advisor":
-            st.session_state.advisor_chat_history = history
-        else:
-            st.session_state.partner_chat_history = history
-        
-        # Update conversation context
-        st.session_state.conversation_context = state["context"]
-        
-        return {"state": state}
+        """Commit the finished turn to the conversation."""
+        inputs["conversation"].add_assistant_message(inputs["reply"])
+        return inputs
 
     chain = RunnableSequence(
         first=RunnableLambda(add_message_to_state),
@@ -243,8 +310,35 @@ def build_chat_chain():
     
     return chain
 
-# Initialize the chain
-chat_chain = build_chat_chain()
+# Built once per process on first use. The chain steps hold no state of
+# their own and read st.session_state of the calling session, so sharing
+# the chain across sessions is safe.
+@st.cache_resource
+def get_chat_chain():
+    return build_chat_chain()
+
+class StreamRenderer:
+    """Renders a streamed reply into a placeholder as chunks arrive.
+
+    Repaints are throttled, since every update is a round trip to the
+    browser.
+    """
+    
+    def __init__(self, placeholder, interval: float = 0.05):
+        self.placeholder = placeholder
+        self.interval = interval
+        self.parts: List[str] = []
+        self.last_render = 0.0
+    
+    def add(self, delta: str) -> None:
+        self.parts.append(delta)
+        now = time.monotonic()
+        if now - self.last_render >= self.interval:
+            self.placeholder.markdown("".join(self.parts) + "▌")
+            self.last_render = now
+    
+    def finish(self, text: str) -> None:
+        self.placeholder.markdown(text)
 
 # UI Components
 def render_sidebar():
@@ -302,7 +396,7 @@ def render_home_tab():
             topics = st.session_state.conversation_context.get("recent_topics", [])
             if topics:
                 st.write("Recent conversations about:")
-                for topic in topics[-3:]:  # Show last 3 topics
+                for topic in topics[:3]:  # Show top 3 topics
                     st.write(f"• {topic.title()}")
             else:
                 st.write("Start a conversation to get personalized advice!")
@@ -323,8 +417,7 @@ def render_chat_tab():
     mode = "Dating Advisor" if st.session_state.chat_mode == "advisor" else "Online Dating Partner"
     st.header(f"💬 Chat with your {mode}")
     
-    # Choose the appropriate chat history based on mode
-    chat_history = st.session_state.advisor_chat_history if st.session_state.chat_mode == "advisor" else st.session_state.partner_chat_history
+    conversation = get_conversation(st.session_state.chat_mode)
     
     # Display mode description
     if st.session_state.chat_mode == "advisor":
@@ -341,7 +434,7 @@ def render_chat_tab():
         st.info(f"I'll be your {gender_pref.lower()} in our roleplay chat. Let's build a meaningful connection! 💝")
     
     # Display chat messages
-    for i, msg in enumerate(chat_history):
+    for msg in conversation.history:
         if isinstance(msg, HumanMessage):
             with st.chat_message("user"):
                 st.write(msg.content)
@@ -352,51 +445,18 @@ def render_chat_tab():
     # Chat input
     user_input = st.chat_input("Type your message here...")
     if user_input:
-        # Initialize state if this is the first message
-        if not chat_history:
-            state = initialize_state(st.session_state.user_id)
-        else:
-            # Reconstruct state from session_state
-            prompt = ONLINE_PARTNER_PROMPT if st.session_state.chat_mode == "partner" else DATING_ADVISOR_PROMPT
-            
-            # Add profile information to the context
-            context = st.session_state.conversation_context.copy()
-            context["profile"] = st.session_state.profile
-            
-            state = ChatState(
-                messages=[{"role": "system", "content": prompt}],
-                context=context,
-                user_id=st.session_state.user_id
-            )
-            
-            # Add previous messages
-            for msg in chat_history:
-                if isinstance(msg, HumanMessage):
-                    state["messages"].append({"role": "user", "content": msg.content})
-                elif isinstance(msg, AIMessage):
-                    state["messages"].append({"role": "assistant", "content": msg.content})
-        
-        # Process through chain with proper input format
-        final_state = chat_chain.invoke({"message": user_input, "state": state})
-        
-        # Update the appropriate chat history
-        history = []
-        for msg in final_state["state"]["messages"]:
-            if msg["role"] == "user":
-                history.append(HumanMessage(content=msg["content"]))
-            elif msg["role"] == "assistant":
-                history.append(AIMessage(content=msg["content"]))
-        
-        if st.session_state.chat_mode == "advisor":
-            st.session_state.advisor_chat_history = history
-        else:
-            st.session_state.partner_chat_history = history
+        with st.chat_message("user"):
+            st.write(user_input)
         
-        # Update conversation context
-        st.session_state.conversation_context = final_state["state"]["context"]
-        
-        # Force a rerun to display the new messages
-        st.rerun()
+        # Stream the reply into the page as it is generated. save_to_session
+        # commits the finished turn to the conversation once, at the end of
+        # the chain, so no rerun is needed to show it.
+        with st.chat_message("assistant", avatar="💌"):
+            renderer = StreamRenderer(st.empty())
+            result = get_chat_chain().invoke(
+                {"message": user_input, "conversation": conversation, "on_token": renderer.add}
+            )
+            renderer.finish(result["reply"])
 
 def render_profile_tab():
     """Render the profile editing interface."""    
@@ -507,6 +567,8 @@ def render_profile_tab():
             "education": education,
             "occupation": occupation
         }
+        # Conversations recompile their system prompt on their next turn
+        st.session_state.profile_version += 1
         st.success("Profile saved successfully!")
         
         # Update the conversation context to reflect new profile details
@@ -542,6 +604,14 @@ def render_matches_tab():
         st.session_state.current_tab = "chat"
         st.rerun()
 
+def ask_advisor(message: str) -> None:
+    """Send a canned question to the advisor and switch to the chat tab."""
+    conversation = get_conversation("advisor")
+    get_chat_chain().invoke({"message": message, "conversation": conversation})
+    st.session_state.chat_mode = "advisor"
+    st.session_state.current_tab = "chat"
+    st.rerun()
+
 def render_tips_tab():
     """Render dating tips section."""    
     st.header("🔍 Dating Tips & Resources")
@@ -568,32 +638,7 @@ def render_tips_tab():
         """)
         
         if st.button("Ask for personalized date ideas"):
-            st.session_state.current_tab = "chat"
-            # Initialize state if this is the first message
-            if not st.session_state.chat_history:
-                state = initialize_state(st.session_state.user_id)
-            else:
-                # Reconstruct state from session_state
-                state = ChatState(
-                    messages=[{"role": "system", "content": DATING_ADVISOR_PROMPT}],
-                    context=st.session_state.conversation_context,
-                    user_id=st.session_state.user_id
-                )
-                
-                # Add previous messages
-                for msg in st.session_state.chat_history:
-                    if isinstance(msg, HumanMessage):
-                        state["messages"].append({"role": "user", "content": msg.content})
-                    elif isinstance(msg, AIMessage):
-                        state["messages"].append({"role": "assistant", "content": msg.content})
-        
-            # Update context
-            state["context"]["recent_topics"].append("date ideas")
-            message = "Can you suggest some unique first date ideas based on my profile and interests?"
-            
-            # Process through chain with proper input format
-            final_state = chat_chain.invoke({"message": message, "state": state})
-            st.rerun()
+            ask_advisor("Can you suggest some unique first date ideas based on my profile and interests?")
     
     elif selected_category == "Conversation Starters":
         st.subheader("Engaging Conversation Starters")
@@ -606,30 +651,7 @@ def render_tips_tab():
         """)
         
         if st.button("Get personalized conversation starters"):
-            st.session_state.current_tab = "chat"
-            message = "Can you suggest some conversation starters tailored to my interests and dating preferences?"
-            
-            # Initialize state if this is the first message
-            if not st.session_state.chat_history:
-                state = initialize_state(st.session_state.user_id)
-            else:
-                # Reconstruct state from session_state
-                state = ChatState(
-                    messages=[{"role": "system", "content": DATING_ADVISOR_PROMPT}],
-                    context=st.session_state.conversation_context,
-                    user_id=st.session_state.user_id
-                )
-                
-                # Add previous messages
-                for msg in st.session_state.chat_history:
-                    if isinstance(msg, HumanMessage):
-                        state["messages"].append({"role": "user", "content": msg.content})
-                    elif isinstance(msg, AIMessage):
-                        state["messages"].append({"role": "assistant", "content": msg.content})
-            
-            # Process through chain with proper input format
-            final_state = chat_chain.invoke({"message": message, "state": state})
-            st.rerun()
+            ask_advisor("Can you suggest some conversation starters tailored to my interests and dating preferences?")
     
     elif selected_category == "Online Dating Profile Tips":
         st.subheader("Creating an Effective Dating Profile")
@@ -642,30 +664,7 @@ def render_tips_tab():
         """)
         
         if st.button("Review my dating profile"):
-            st.session_state.current_tab = "chat"
-            message = "Based on my profile information, can you help me create an effective dating profile description?"
-            
-            # Initialize state if this is the first message
-            if not st.session_state.chat_history:
-                state = initialize_state(st.session_state.user_id)
-            else:
-                # Reconstruct state from session_state
-                state = ChatState(
-                    messages=[{"role": "system", "content": DATING_ADVISOR_PROMPT}],
-                    context=st.session_state.conversation_context,
-                    user_id=st.session_state.user_id
-                )
-                
-                # Add previous messages
-                for msg in st.session_state.chat_history:
-                    if isinstance(msg, HumanMessage):
-                        state["messages"].append({"role": "user", "content": msg.content})
-                    elif isinstance(msg, AIMessage):
-                        state["messages"].append({"role": "assistant", "content": msg.content})
-            
-            # Process through chain with proper input format
-            final_state = chat_chain.invoke({"message": message, "state": state})
-            st.rerun()
+            ask_advisor("Based on my profile information, can you help me create an effective dating profile description?")
     
     elif selected_category == "Understanding Red & Green Flags":
         st.subheader("Recognizing Relationship Patterns")
@@ -695,30 +694,7 @@ def render_tips_tab():
             """)
         
         if st.button("Discuss relationship patterns"):
-            st.session_state.current_tab = "chat"
-            message = "Can you help me understand how to recognize healthy relationship patterns in dating?"
-            
-            # Initialize state if this is the first message
-            if not st.session_state.chat_history:
-                state = initialize_state(st.session_state.user_id)
-            else:
-                # Reconstruct state from session_state
-                state = ChatState(
-                    messages=[{"role": "system", "content": DATING_ADVISOR_PROMPT}],
-                    context=st.session_state.conversation_context,
-                    user_id=st.session_state.user_id
-                )
-                
-                # Add previous messages
-                for msg in st.session_state.chat_history:
-                    if isinstance(msg, HumanMessage):
-                        state["messages"].append({"role": "user", "content": msg.content})
-                    elif isinstance(msg, AIMessage):
-                        state["messages"].append({"role": "assistant", "content": msg.content})
-            
-            # Process through chain with proper input format
-            final_state = chat_chain.invoke({"message": message, "state": state})
-            st.rerun()
+            ask_advisor("Can you help me understand how to recognize healthy relationship patterns in dating?")
     
     elif selected_category == "Building Healthy Relationships":
         st.subheader("Foundations of Healthy Relationships")
@@ -731,30 +707,7 @@ def render_tips_tab():
         """)
         
         if st.button("Learn more about healthy relationships"):
-            st.session_state.current_tab = "chat"
-            message = "What are some ways to build a strong foundation for a healthy relationship from the beginning?"
-            
-            # Initialize state if this is the first message
-            if not st.session_state.chat_history:
-                state = initialize_state(st.session_state.user_id)
-            else:
-                # Reconstruct state from session_state
-                state = ChatState(
-                    messages=[{"role": "system", "content": DATING_ADVISOR_PROMPT}],
-                    context=st.session_state.conversation_context,
-                    user_id=st.session_state.user_id
-                )
-                
-                # Add previous messages
-                for msg in st.session_state.chat_history:
-                    if isinstance(msg, HumanMessage):
-                        state["messages"].append({"role": "user", "content": msg.content})
-                    elif isinstance(msg, AIMessage):
-                        state["messages"].append({"role": "assistant", "content": msg.content})
-            
-            # Process through chain with proper input format
-            final_state = chat_chain.invoke({"message": message, "state": state})
-            st.rerun()
+            ask_advisor("What are some ways to build a strong foundation for a healthy relationship from the beginning?")
 
 # Main application
 def main():
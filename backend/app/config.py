@@ -1,6 +1,7 @@
-from pydantic import BaseSettings, SecretStr, AnyHttpUrl
-from typing import List, Union
+from pydantic import BaseSettings, SecretStr, validator
+from typing import Dict, List, Optional, Tuple
 from functools import lru_cache
+from urllib.parse import urlsplit
 
 class Settings(BaseSettings):
     """Application settings using Pydantic for validation."""
@@ -9,19 +10,74 @@ class Settings(BaseSettings):
     APP_ENV: str = "development"
     APP_NAME: str = "Date Mate API"
     APP_VERSION: str = "1.0.0"
+    # Level of the app's own loggers; uvicorn and libraries are configured separately
+    LOG_LEVEL: str = "INFO"
+    # Serialize responses in one pass (with orjson when installed) and skip
+    # re-validating already valid data against response_model
+    FAST_JSON_RESPONSES: bool = True
     
     # Security
     GROQ_API_KEY: SecretStr
     JWT_SECRET_KEY: SecretStr = SecretStr("development_secret")
     JWT_ALGORITHM: str = "HS256"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    JWT_CACHE_SIZE: int = 10000  # verified tokens kept in memory, 0 disables
+    
+    # LLM API. Any OpenAI-compatible chat completions server works, such as
+    # the fake one in benchmarks/fake_llm.py used for load tests.
+    GROQ_API_BASE_URL: str = "https://api.groq.com/openai/v1"
+    GROQ_MODEL: str = "mixtral-8x7b-32768"
     
     # CORS
-    CORS_ORIGINS: Union[str, List[AnyHttpUrl]] = ["*"]
+    CORS_ORIGINS: List[str] = ["*"]
     
     # Rate Limiting
     RATE_LIMIT_REQUESTS: int = 100
     RATE_LIMIT_PERIOD: int = 3600  # 1 hour in seconds
+    RATE_LIMIT_EXEMPT_PATHS: List[str] = [
+        "/health", "/metrics", "/docs", "/redoc", "/openapi.json"
+    ]
+    # Extra cost classes with their own budget per period. RATE_LIMIT_REQUESTS
+    # is the "default" budget. Adding "<class>_tokens" also charges requests
+    # in that class for the LLM tokens they use.
+    RATE_LIMIT_BUDGETS: Dict[str, int] = {"llm": 30}
+    # "METHOD /path/prefix" -> (cost class, weight); other routes cost 1 default
+    RATE_LIMIT_ROUTE_COSTS: Dict[str, Tuple[str, float]] = {
+        "POST /api/chat": ("llm", 1),
+        "GET /api/matches": ("default", 2),
+    }
+    
+    # Request profiling. Profiles a random fraction of requests, plus any
+    # request sending X-Admin-Token; results are served under /admin.
+    ADMIN_TOKEN: Optional[SecretStr] = None
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_INTERVAL_MS: float = 5.0
+    PROFILING_BUFFER_SIZE: int = 200
+    
+    # Request tracing. Spans are returned in a Server-Timing header and, if
+    # TRACE_EXPORT_PATH is set, appended to that file as JSON lines.
+    TRACING_ENABLED: bool = True
+    TRACE_EXPORT_PATH: str = ""
+    
+    # Startup warm-up, run before /health reports ready
+    WARMUP_LLM_CONNECTION: bool = True
+    # Send a synthetic request through each router (none reach the LLM)
+    WARMUP_SYNTHETIC_REQUESTS: bool = False
+    
+    # State snapshots (disabled when SNAPSHOT_PATH is empty)
+    SNAPSHOT_PATH: str = ""
+    SNAPSHOT_INTERVAL_SECONDS: int = 300
+    
+    @validator("CORS_ORIGINS", each_item=True)
+    def validate_origin(cls, origin: str) -> str:
+        # Checked with urlsplit rather than AnyHttpUrl, whose regex takes
+        # ~80 ms to compile on first use and dominated settings loading
+        if origin == "*":
+            return origin
+        parts = urlsplit(origin)
+        if parts.scheme not in ("http", "https") or not parts.netloc:
+            raise ValueError(f"{origin!r} is not an http(s) origin")
+        return origin
     
     class Config:
         env_file = ".env"
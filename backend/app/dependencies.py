@@ -1,18 +1,26 @@
 from fastapi import HTTPException, Request, Depends
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
+import hashlib
 import time
 
 from .config import get_settings
 from .networks.exceptions import AuthenticationException, RateLimitException
+from .rate_limiter import CostRateLimiter, DEFAULT_COST_CLASS
+from .tracing import span
 
 settings = get_settings()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-# Simple in-memory rate limiting store
-rate_limit_store: Dict[str, Dict] = {}
+# In-memory sliding-window rate limiters, one per cost class; idle keys are evicted
+rate_limiter = CostRateLimiter(
+    {DEFAULT_COST_CLASS: settings.RATE_LIMIT_REQUESTS, **settings.RATE_LIMIT_BUDGETS},
+    settings.RATE_LIMIT_PERIOD,
+    settings.RATE_LIMIT_ROUTE_COSTS
+)
+rate_limit_store = rate_limiter.limiters[DEFAULT_COST_CLASS].store
 
 def get_rate_limit_key(request: Request) -> str:
     """Get rate limit key based on IP address."""
@@ -20,26 +28,62 @@ def get_rate_limit_key(request: Request) -> str:
 
 async def check_rate_limit(request: Request):
     """Rate limiting middleware."""
-    key = get_rate_limit_key(request)
-    now = time.time()
-    
-    if key in rate_limit_store:
-        # Clean old requests
-        rate_limit_store[key]["requests"] = [
-            req_time for req_time in rate_limit_store[key]["requests"]
-            if now - req_time < settings.RATE_LIMIT_PERIOD
-        ]
-        
-        # Check limit
-        if len(rate_limit_store[key]["requests"]) >= settings.RATE_LIMIT_REQUESTS:
-            raise RateLimitException()
-        
-        rate_limit_store[key]["requests"].append(now)
-    else:
-        rate_limit_store[key] = {"requests": [now]}
+    cost_class, weight = rate_limiter.route_cost(request.method, request.url.path)
+    if not rate_limiter.hit(get_rate_limit_key(request), cost_class, weight).allowed:
+        raise RateLimitException()
+
+class VerifiedTokenCache:
+    """Bounded LRU cache of already verified JWTs.
+
+    Entries are keyed by a SHA-256 of the token, hold only the subject and
+    expiry, and are dropped once the token expires. The whole cache is
+    cleared when the secret or algorithm settings change.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, Tuple[str, float]]" = OrderedDict()
+        self._fingerprint: Optional[Tuple[str, str]] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _check_settings(self) -> None:
+        fingerprint = (settings.JWT_ALGORITHM, settings.JWT_SECRET_KEY.get_secret_value())
+        if fingerprint != self._fingerprint:
+            self._entries.clear()
+            self._fingerprint = fingerprint
+
+    def get(self, token: str) -> Optional[str]:
+        """Get the user_id for a cached, unexpired token."""
+        self._check_settings()
+        key = hashlib.sha256(token.encode()).digest()
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, token: str, user_id: str, exp: float) -> None:
+        """Cache a verified token until its expiry."""
+        if self.max_size <= 0:
+            return
+        self._entries[hashlib.sha256(token.encode()).digest()] = (user_id, exp)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+token_cache = VerifiedTokenCache(settings.JWT_CACHE_SIZE)
 
 def create_access_token(data: dict) -> str:
     """Create JWT access token."""
+    from jose import jwt
+    
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
@@ -50,27 +94,51 @@ def create_access_token(data: dict) -> str:
         algorithm=settings.JWT_ALGORITHM
     )
 
+def warm_up_auth() -> None:
+    """Load the JWT library by round-tripping a token, ahead of the first request."""
+    from jose import jwt
+    
+    jwt.decode(
+        create_access_token({"sub": "warmup"}),
+        settings.JWT_SECRET_KEY.get_secret_value(),
+        algorithms=[settings.JWT_ALGORITHM]
+    )
+
 async def get_current_user(token: str = Depends(oauth2_scheme)) -> str:
     """Validate JWT token and return user_id."""
-    try:
-        payload = jwt.decode(
-            token,
-            settings.JWT_SECRET_KEY.get_secret_value(),
-            algorithms=[settings.JWT_ALGORITHM]
-        )
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise AuthenticationException()
-    except JWTError:
-        raise AuthenticationException()
+    with span("auth"):
+        user_id = token_cache.get(token)
+        if user_id is not None:
+            return user_id
+
+        # Imported on first use: jose and its crypto backends add ~40 ms to
+        # startup, and cached tokens never need it
+        from jose import JWTError, jwt
         
-    return user_id
+        try:
+            payload = jwt.decode(
+                token,
+                settings.JWT_SECRET_KEY.get_secret_value(),
+                algorithms=[settings.JWT_ALGORITHM]
+            )
+            user_id: str = payload.get("sub")
+            if user_id is None:
+                raise AuthenticationException()
+        except JWTError:
+            raise AuthenticationException()
+
+        # Tokens without an expiry are never cached
+        if isinstance(payload.get("exp"), (int, float)):
+            token_cache.put(token, user_id, payload["exp"])
+        return user_id
 
 # Common dependencies for routes
 async def common_params(
     request: Request,
     current_user: str = Depends(get_current_user)
 ) -> Dict:
-    """Common parameters and checks for routes."""
-    await check_rate_limit(request)
+    """Common parameters and checks for routes.
+
+    Rate limiting is applied once per request by RateLimitMiddleware.
+    """
     return {"user_id": current_user}
\ No newline at end of file
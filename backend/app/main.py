@@ -1,6 +1,11 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from contextlib import asynccontextmanager, suppress
+import asyncio
+import logging
+import time
+
 from .routers import chat_router, profile_router, matches_router
 from .networks.handlers import exception_handlers
 from .networks.exceptions import (
@@ -11,25 +16,100 @@ from .networks.exceptions import (
     RateLimitException
 )
 from .config import get_settings
-from .dependencies import check_rate_limit
-import time
-from starlette.middleware.base import BaseHTTPMiddleware
+from .dependencies import create_access_token, rate_limiter, warm_up_auth
+from .middleware.metrics import WARMUP_CLIENT, MetricsMiddleware
+from .middleware.rate_limit import RateLimitMiddleware
+from .middleware.tracing import TracingMiddleware
+from . import metrics
+from . import snapshot
+from . import tracing
 
 settings = get_settings()
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        await check_rate_limit(request)
-        return await call_next(request)
+# Make the request id available to log formats as %(request_id)s, and
+# print the app's own logs with it; other loggers are left alone
+tracing.install_log_context()
+tracing.install_log_handler("app", settings.LOG_LEVEL)
+
+logger = logging.getLogger(__name__)
+
+async def send_synthetic_requests() -> None:
+    """Send one request through each router to warm up routing and validation.
+
+    None of them changes state or reaches the LLM: the profile and matches
+    lookups miss, and the chat request fails body validation. They come
+    from WARMUP_CLIENT, so request metrics leave them out.
+    """
+    import httpx
+    
+    transport = httpx.ASGITransport(app=app, client=WARMUP_CLIENT)
+    headers = {"X-Request-ID": "warmup"}
+    async with httpx.AsyncClient(transport=transport, base_url="http://warmup", headers=headers) as client:
+        await client.get("/health")
+        headers["Authorization"] = f"Bearer {create_access_token({'sub': 'warmup'})}"
+        await client.get("/api/profile/warmup", headers=headers)
+        await client.get("/api/matches/warmup", headers=headers)
+        await client.post("/api/chat/advisor", json={}, headers=headers)
+
+async def warm_up(app: FastAPI) -> None:
+    """Warm up connections and code paths, then mark the app ready."""
+    started = time.perf_counter()
+    warm_up_auth()
+    if settings.WARMUP_LLM_CONNECTION:
+        try:
+            await chat_router.warm_up_connection()
+        except Exception as e:
+            logger.warning("Could not pre-connect to the LLM API: %s", e)
+    if settings.WARMUP_SYNTHETIC_REQUESTS:
+        try:
+            await send_synthetic_requests()
+        except Exception:
+            logger.exception("Synthetic warm-up requests failed")
+    app.state.ready = True
+    logger.info("Warm-up finished in %.1f ms", (time.perf_counter() - started) * 1000)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load state and warm up on startup; persist state and clean up on shutdown."""
+    app.state.ready = False
+    # State is loaded before serving, so no request sees an empty store
+    if settings.SNAPSHOT_PATH:
+        snapshot.restore(settings.SNAPSHOT_PATH, profile_router.profiles, chat_router.chat_states)
+    snapshot_task = snapshot.start_periodic(
+        settings.SNAPSHOT_PATH,
+        settings.SNAPSHOT_INTERVAL_SECONDS,
+        profile_router.profiles,
+        chat_router.chat_states
+    )
+    # Warm-up runs while serving; /health reports not ready until it is done
+    warmup_task = asyncio.create_task(warm_up(app))
+    
+    yield
+    
+    app.state.ready = False
+    for task in (warmup_task, snapshot_task):
+        if task:
+            task.cancel()
+            # A periodic save in progress finishes before the final one
+            with suppress(asyncio.CancelledError):
+                await task
+    if settings.SNAPSHOT_PATH:
+        await snapshot.save(settings.SNAPSHOT_PATH, profile_router.profiles, chat_router.chat_states)
+    await chat_router.close_http_client()
 
 app = FastAPI(
     title="Date Mate API",
     description="Dating advisor and matchmaking API",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Add middleware
-app.add_middleware(RateLimitMiddleware)
+app.add_middleware(
+    RateLimitMiddleware,
+    limiter=rate_limiter,
+    exempt_paths=settings.RATE_LIMIT_EXEMPT_PATHS
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -39,6 +119,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Profiling is opt-in: a sample rate or an admin token must be configured.
+# Its modules are only imported when it is enabled.
+admin_token = settings.ADMIN_TOKEN.get_secret_value() if settings.ADMIN_TOKEN else None
+if settings.PROFILING_SAMPLE_RATE > 0 or admin_token:
+    from .middleware.profiling import ProfilingMiddleware
+    from .profiling import sampler
+    
+    app.add_middleware(
+        ProfilingMiddleware,
+        sampler=sampler,
+        sample_rate=settings.PROFILING_SAMPLE_RATE,
+        admin_token=admin_token
+    )
+
+# Wraps rate limiting and CORS, so rejected requests are counted too
+app.add_middleware(MetricsMiddleware)
+
+# Outermost of our middleware, so spans cover everything below it
+if settings.TRACING_ENABLED:
+    exporter = tracing.TraceExporter(settings.TRACE_EXPORT_PATH) if settings.TRACE_EXPORT_PATH else None
+    app.add_middleware(TracingMiddleware, exporter=exporter)
+
 # Add trusted host middleware
 app.add_middleware(
     TrustedHostMiddleware,
@@ -53,12 +155,31 @@ for exc, handler in exception_handlers.items():
 app.include_router(chat_router.router)
 app.include_router(profile_router.router)
 app.include_router(matches_router.router)
+if admin_token:
+    from .routers import admin_router
+    
+    app.include_router(admin_router.router)
+
+metrics.PROFILES.set_function(lambda: len(profile_router.profiles))
+metrics.CHAT_STATES.set_function(lambda: len(chat_router.chat_states))
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint() -> Response:
+    """Metrics in Prometheus text exposition format."""
+    return Response(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
 
 @app.get("/health")
-async def health_check():
-    """Health check endpoint."""
+async def health_check(response: Response):
+    """Health check endpoint.
+
+    Returns 503 until startup warm-up has finished, so load balancers
+    only route to warm workers.
+    """
+    ready = getattr(app.state, "ready", False)
+    if not ready:
+        response.status_code = 503
     return {
-        "status": "healthy",
+        "status": "ready" if ready else "starting",
         "version": settings.APP_VERSION,
         "environment": settings.APP_ENV
     }
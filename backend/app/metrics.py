@@ -0,0 +1,245 @@
+"""In-process metrics with Prometheus text exposition.
+
+Recording is a dict lookup plus a few integer/float increments with no
+locks. All request handling runs on the event loop thread, so updates
+cannot interleave; the GIL keeps them memory-safe if a threadpool ever
+records too.
+"""
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LLM_LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 30.0)
+SIZE_BUCKETS = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Metric:
+    """Base class for a metric family with optional labels."""
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], "Metric"] = {}
+        REGISTRY.register(self)
+
+    def labels(self, *values: str):
+        """Get the child metric for a set of label values."""
+        child = self._children.get(values)
+        if child is None:
+            child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _samples(self) -> List[str]:
+        if self.labelnames:
+            items = list(self._children.items())
+        else:
+            items = [((), self)]
+        lines = []
+        for values, child in items:
+            lines.extend(child._child_samples(self.name, self.labelnames, values))
+        return lines
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+class _CounterValue:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+    def _child_samples(self, name, labelnames, values):
+        return [f"{name}{_format_labels(labelnames, values)} {_format_value(self.value)}"]
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._value = _CounterValue()
+
+    def _new_child(self):
+        return _CounterValue()
+
+    def inc(self, amount: float = 1) -> None:
+        self._value.inc(amount)
+
+    def _child_samples(self, name, labelnames, values):
+        return self._value._child_samples(name, labelnames, values)
+
+class _GaugeValue(_CounterValue):
+    __slots__ = ()
+
+    def dec(self, amount: float = 1) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+class Gauge(Metric):
+    """Value that can go up and down, or be computed at scrape time."""
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        function: Optional[Callable[[], float]] = None
+    ):
+        super().__init__(name, documentation, labelnames)
+        self._value = _GaugeValue()
+        self._function = function
+
+    def _new_child(self):
+        return _GaugeValue()
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Compute the value by calling function on every scrape."""
+        self._function = function
+
+    def inc(self, amount: float = 1) -> None:
+        self._value.inc(amount)
+
+    def dec(self, amount: float = 1) -> None:
+        self._value.dec(amount)
+
+    def set(self, value: float) -> None:
+        self._value.set(value)
+
+    def _child_samples(self, name, labelnames, values):
+        if self._function is not None:
+            self._value.set(self._function())
+        return self._value._child_samples(name, labelnames, values)
+
+class _HistogramValue:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        # One count per bucket plus the +Inf overflow bucket
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def _child_samples(self, name, labelnames, values):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            cumulative += count
+            le = f'le="{_format_value(float(bound))}"'
+            lines.append(f"{name}_bucket{_format_labels(labelnames, values, le)} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labelnames, values)} {_format_value(self.sum)}")
+        lines.append(f"{name}_count{_format_labels(labelnames, values)} {cumulative}")
+        return lines
+
+class Histogram(Metric):
+    """Distribution of observed values over fixed buckets."""
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+        self._value = _HistogramValue(self.buckets)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._value.observe(value)
+
+    def _child_samples(self, name, labelnames, values):
+        return self._value._child_samples(name, labelnames, values)
+
+class Registry:
+    """Collection of metrics rendered together on /metrics."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        """Render all metrics in Prometheus text exposition format."""
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+REGISTRY = Registry()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# HTTP
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route and status.", ("method", "route", "status")
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route.", ("method", "route")
+)
+REQUESTS_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests currently being handled.")
+RATE_LIMIT_REJECTIONS = Counter(
+    "rate_limit_rejections_total", "Requests rejected by the rate limiter.", ("cost_class",)
+)
+
+# LLM
+LLM_LATENCY = Histogram(
+    "llm_request_duration_seconds", "Total LLM API call latency.", ("model",),
+    buckets=LLM_LATENCY_BUCKETS
+)
+LLM_TIME_TO_FIRST_TOKEN = Histogram(
+    "llm_time_to_first_token_seconds",
+    "Time until the first streamed token of an LLM reply arrives.", ("model",),
+    buckets=LLM_LATENCY_BUCKETS
+)
+LLM_TOKENS = Counter("llm_tokens_total", "LLM tokens used.", ("model", "type"))
+LLM_ERRORS = Counter("llm_request_errors_total", "Failed LLM API calls.", ("model",))
+
+# Matching
+MATCH_SCAN_SIZE = Histogram(
+    "match_scan_candidates", "Candidate profiles scanned per matches request.",
+    buckets=SIZE_BUCKETS
+)
+MATCH_SCAN_LATENCY = Histogram(
+    "match_scan_duration_seconds", "Time spent scanning and scoring candidates."
+)
+
+# State sizes, computed at scrape time
+CHAT_STATES = Gauge("chat_states", "Chat states held in memory.")
+PROFILES = Gauge("profiles", "Profiles held in the profile store.")
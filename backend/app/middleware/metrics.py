@@ -0,0 +1,44 @@
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+import time
+
+from .. import metrics
+
+# Client address of in-process warm-up requests. Servers only report real
+# socket addresses, so outside traffic cannot use it to skip metrics.
+WARMUP_CLIENT = ("warmup", 0)
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording request counts, latency and in-flight requests.
+
+    Warm-up requests from WARMUP_CLIENT are not recorded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope.get("client") == WARMUP_CLIENT:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metrics.REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.REQUESTS_IN_FLIGHT.dec()
+            # Label by route template to keep cardinality bounded; anything
+            # without one (404s, mounted apps) shares a single label
+            route = scope.get("route")
+            path = route.path if route is not None else "<unmatched>"
+            method = scope["method"]
+            metrics.REQUEST_LATENCY.labels(method, path).observe(time.perf_counter() - started)
+            metrics.REQUESTS.labels(method, path, str(status)).inc()
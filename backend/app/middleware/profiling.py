@@ -0,0 +1,45 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+from typing import Optional
+import random
+import secrets
+
+from ..profiling import StackSampler
+
+ADMIN_TOKEN_HEADER = b"x-admin-token"
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware profiling sampled or admin-requested requests."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        sampler: StackSampler,
+        sample_rate: float = 0.0,
+        admin_token: Optional[str] = None
+    ):
+        self.app = app
+        self.sampler = sampler
+        self.sample_rate = sample_rate
+        self.admin_token = admin_token.encode() if admin_token else None
+
+    def should_profile(self, scope: Scope) -> bool:
+        """Decide whether to profile a request."""
+        if self.sample_rate and random.random() < self.sample_rate:
+            return True
+        if self.admin_token:
+            for name, value in scope["headers"]:
+                if name == ADMIN_TOKEN_HEADER:
+                    return secrets.compare_digest(value, self.admin_token)
+        return False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile = self.sampler.start_profile(scope["method"], scope["path"])
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            route = scope.get("route")
+            self.sampler.finish_profile(profile, route.path if route is not None else None)
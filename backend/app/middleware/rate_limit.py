@@ -0,0 +1,79 @@
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Iterable, List, Tuple
+import math
+
+from .. import metrics
+from ..networks.exceptions import RateLimitException
+from ..networks.handlers import base_exception_handler
+from ..rate_limiter import CostRateLimiter, RateLimitResult
+from ..tracing import span
+
+def rate_limit_headers(result: RateLimitResult) -> List[Tuple[bytes, bytes]]:
+    """Build standard RateLimit-* headers for a limiter result."""
+    headers = [
+        (b"ratelimit-limit", str(result.limit).encode()),
+        (b"ratelimit-remaining", str(result.remaining).encode()),
+        (b"ratelimit-reset", str(math.ceil(result.reset_after)).encode()),
+    ]
+    if not result.allowed:
+        headers.append((b"retry-after", str(math.ceil(result.reset_after)).encode()))
+    return headers
+
+class RateLimitMiddleware:
+    """Pure ASGI middleware applying the rate limiter once per request.
+
+    Routes that call the LLM report the tokens they used in
+    request.state.llm_tokens, which is charged after the response.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiter: CostRateLimiter,
+        exempt_paths: Iterable[str] = ()
+    ):
+        self.app = app
+        self.limiter = limiter
+        self.exempt_paths = tuple(exempt_paths)
+
+    def is_exempt(self, path: str) -> bool:
+        """Check whether a path is excluded from rate limiting."""
+        for exempt in self.exempt_paths:
+            if path == exempt or path.startswith(exempt + "/"):
+                return True
+        return False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self.is_exempt(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        key = client[0] if client else "unknown"
+        with span("rate_limit"):
+            cost_class, weight = self.limiter.route_cost(scope["method"], scope["path"])
+            result = self.limiter.hit(key, cost_class, weight)
+            headers = rate_limit_headers(result)
+
+        if not result.allowed:
+            metrics.RATE_LIMIT_REJECTIONS.labels(cost_class).inc()
+            exc = RateLimitException(
+                headers={name.decode(): value.decode() for name, value in headers}
+            )
+            response = await base_exception_handler(Request(scope), exc)
+            await response(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", ())) + headers
+            await send(message)
+
+        # Shared with request.state, so routes can report LLM token usage
+        state = scope.setdefault("state", {})
+        await self.app(scope, receive, send_with_headers)
+
+        tokens = state.get("llm_tokens")
+        if tokens:
+            self.limiter.charge_tokens(key, cost_class, tokens)
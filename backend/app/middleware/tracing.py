@@ -0,0 +1,51 @@
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Optional
+import re
+import uuid
+
+from ..tracing import TraceExporter, start_trace
+
+# Incoming request ids are reused only if they are short and harmless
+_REQUEST_ID = re.compile(rb"[A-Za-z0-9._-]{1,64}")
+
+class TracingMiddleware:
+    """Pure ASGI middleware starting a trace for every HTTP request.
+
+    The request id is taken from X-Request-ID or generated, and returned
+    with the spans recorded so far in X-Request-ID and Server-Timing
+    headers. Finished traces are exported if an exporter is given.
+    """
+
+    def __init__(self, app: ASGIApp, exporter: Optional[TraceExporter] = None):
+        self.app = app
+        self.exporter = exporter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id" and _REQUEST_ID.fullmatch(value):
+                request_id = value.decode()
+                break
+        trace = start_trace(request_id or uuid.uuid4().hex, scope["method"], scope["path"])
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                trace.status = message["status"]
+                message["headers"] = list(message.get("headers", ())) + [
+                    (b"x-request-id", trace.request_id.encode()),
+                    (b"server-timing", trace.server_timing().encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            trace.finish()
+            route = scope.get("route")
+            trace.route = route.path if route is not None else None
+            if self.exporter is not None:
+                self.exporter.export(trace)
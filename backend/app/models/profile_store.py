@@ -0,0 +1,420 @@
+from bisect import bisect_left, insort
+from heapq import heappop, heappush
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from .schemas import UserProfile
+
+# UserProfile fields stored as interned tuples
+LIST_FIELDS = (
+    "interested_in",
+    "hobbies",
+    "personality_traits",
+    "ideal_partner_traits",
+    "deal_breakers",
+    "life_goals",
+    "values",
+    "languages",
+)
+
+# Low-cardinality string fields that are worth interning
+INTERNED_FIELDS = (
+    "gender",
+    "relationship_goals",
+    "love_language",
+    "communication_style",
+    "location",
+    "education",
+    "occupation",
+)
+
+# Fields describing the person themselves, checked against the other
+# side's deal-breakers
+TRAIT_LIST_FIELDS = ("personality_traits", "hobbies", "values", "life_goals")
+TRAIT_FIELDS = ("relationship_goals", "communication_style", "love_language", "education", "occupation")
+
+class Vocabulary:
+    """Shared table of canonical string instances."""
+
+    def __init__(self):
+        self._strings: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def intern(self, value: str) -> str:
+        """Return the canonical instance of a string."""
+        return self._strings.setdefault(value, value)
+
+    def intern_all(self, values: Iterable[str]) -> Tuple[str, ...]:
+        """Intern a list of strings into a tuple."""
+        strings = self._strings
+        return tuple([strings.setdefault(value, value) for value in values])
+
+def location_key(location: str) -> str:
+    """Normalize a location for exact, case-insensitive matching."""
+    return location.strip().casefold()
+
+def _age_range(ages: List[Tuple[int, str]], min_age: Optional[int], max_age: Optional[int]) -> Iterator[str]:
+    """Iterate over the user ids in a sorted (age, user_id) list within an age range."""
+    low = bisect_left(ages, (min_age,)) if min_age is not None else 0
+    high = bisect_left(ages, (max_age + 1,)) if max_age is not None else len(ages)
+    for index in range(low, high):
+        yield ages[index][1]
+
+def _remove(ages: List[Tuple[int, str]], key: Tuple[int, str]) -> None:
+    del ages[bisect_left(ages, key)]
+
+# Bump when the index structures below change. Snapshots with another
+# layout still load; their indexes are rebuilt from the profiles.
+INDEX_LAYOUT = 1
+
+# TermBits assigns bits 1..MAX_TERM_BITS; bit 0 is shared by any further terms
+MAX_TERM_BITS = 256
+OVERFLOW_BIT = 1
+
+def term_key(term: str) -> str:
+    """Normalize a trait or deal-breaker for case-insensitive matching."""
+    return term.strip().casefold()
+
+class TermBits:
+    """Compiles sets of terms into int bitsets for deal-breaker checks.
+
+    Only a term that is both some profile's trait and some profile's
+    deal-breaker can cause a conflict, so only such terms get a bit. Both
+    sides are reference counted, and a bit is freed for reuse as soon as
+    either count drops to zero. Once MAX_TERM_BITS are taken, further
+    terms all share OVERFLOW_BIT, and a match on it alone must be checked
+    against the terms themselves. Bitsets thus stay small however many
+    distinct free-text terms profiles use.
+
+    Every assignment takes the next stamp, and a bitset compiled at stamp
+    s reflects only the bits assigned up to s.
+    """
+
+    def __init__(self):
+        self._trait_refs: Dict[str, int] = {}
+        self._deal_breaker_refs: Dict[str, int] = {}
+        # term key -> (bit, stamp at assignment)
+        self._bits: Dict[str, Tuple[int, int]] = {}
+        # Heap of free bit positions, lowest first to keep bitsets short
+        self._free = list(range(1, MAX_TERM_BITS + 1))
+        self.stamp = 0
+
+    def __len__(self) -> int:
+        return len(self._bits)
+
+    def add(self, traits: Set[str], deal_breakers: Set[str]) -> None:
+        """Count a profile's term keys."""
+        for key in traits:
+            self._acquire(key, self._trait_refs, self._deal_breaker_refs)
+        for key in deal_breakers:
+            self._acquire(key, self._deal_breaker_refs, self._trait_refs)
+
+    def remove(self, traits: Set[str], deal_breakers: Set[str]) -> None:
+        """Uncount term keys previously passed to add."""
+        for key in traits:
+            self._release(key, self._trait_refs)
+        for key in deal_breakers:
+            self._release(key, self._deal_breaker_refs)
+
+    def _acquire(self, key: str, refs: Dict[str, int], other_refs: Dict[str, int]) -> None:
+        count = refs.get(key, 0)
+        refs[key] = count + 1
+        if not count and key in other_refs:
+            self.stamp += 1
+            bit = 1 << heappop(self._free) if self._free else OVERFLOW_BIT
+            self._bits[key] = (bit, self.stamp)
+
+    def _release(self, key: str, refs: Dict[str, int]) -> None:
+        count = refs[key] - 1
+        if count:
+            refs[key] = count
+            return
+        del refs[key]
+        bit, _ = self._bits.pop(key, (OVERFLOW_BIT, 0))
+        if bit != OVERFLOW_BIT:
+            heappush(self._free, bit.bit_length() - 1)
+
+    def export_state(self) -> Dict[str, Any]:
+        """Shallow-copy the term table for a snapshot."""
+        return {
+            "trait_refs": dict(self._trait_refs),
+            "deal_breaker_refs": dict(self._deal_breaker_refs),
+            "bits": dict(self._bits),
+            "free": list(self._free),
+            "stamp": self.stamp,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "TermBits":
+        terms = cls()
+        terms._trait_refs = state["trait_refs"]
+        terms._deal_breaker_refs = state["deal_breaker_refs"]
+        terms._bits = state["bits"]
+        terms._free = state["free"]
+        terms.stamp = state["stamp"]
+        return terms
+
+    def compile(self, keys: Iterable[str]) -> Tuple[int, int]:
+        """Return the bitset of term keys and the newest stamp among its bits."""
+        mask = newest = 0
+        bits = self._bits
+        for key in keys:
+            entry = bits.get(key)
+            if entry is not None:
+                mask |= entry[0]
+                if entry[1] > newest:
+                    newest = entry[1]
+        return mask, newest
+
+def profile_traits(profile: "CompactProfile") -> Iterator[str]:
+    """Iterate over the terms that describe a profile's owner."""
+    for field in TRAIT_LIST_FIELDS:
+        yield from getattr(profile, field)
+    for field in TRAIT_FIELDS:
+        value = getattr(profile, field)
+        if value:
+            yield value
+
+def trait_keys(profile: "CompactProfile") -> Set[str]:
+    return {term_key(term) for term in profile_traits(profile)}
+
+def deal_breaker_keys(profile: "CompactProfile") -> Set[str]:
+    return {term_key(term) for term in profile.deal_breakers}
+
+class CompactProfile:
+    """Compact, read-only form of a stored UserProfile.
+
+    Exposes the same attribute names as UserProfile so matching code can
+    use either form.
+    """
+    __slots__ = ("name", "age") + INTERNED_FIELDS + LIST_FIELDS
+
+    def __init__(self, profile: UserProfile, vocabulary: Vocabulary):
+        self.name = profile.name
+        self.age = profile.age
+        for field in INTERNED_FIELDS:
+            setattr(self, field, vocabulary.intern(getattr(profile, field)))
+        for field in LIST_FIELDS:
+            setattr(self, field, vocabulary.intern_all(getattr(profile, field)))
+
+    def __getstate__(self) -> Tuple:
+        # Positional state keeps snapshots small and fast to load
+        return tuple([getattr(self, slot) for slot in self.__slots__])
+
+    def __setstate__(self, state: Tuple) -> None:
+        for slot, value in zip(self.__slots__, state):
+            setattr(self, slot, value)
+
+    def to_dict(self, exclude: Optional[Set[str]] = None) -> Dict[str, Any]:
+        """Convert to a plain dict in UserProfile wire format."""
+        data = {}
+        for field in UserProfile.__fields__:
+            if exclude and field in exclude:
+                continue
+            value = getattr(self, field)
+            data[field] = list(value) if type(value) is tuple else value
+        return data
+
+class ProfileStore:
+    """In-memory profile store keeping profiles in compact form.
+
+    Also tracks version counters for ETags and buckets profiles by gender
+    so matching only scans compatible candidates. Each profile's traits and
+    deal-breakers are compiled into bitsets (see TermBits) on write, so
+    deal-breakers can be checked with two ANDs per candidate. Within each gender, profiles
+    are also kept sorted by age, overall and per location, so age and
+    location filters only visit the profiles in range.
+    """
+
+    def __init__(self):
+        self.vocabulary = Vocabulary()
+        self._profiles: Dict[str, CompactProfile] = {}
+        self._versions: Dict[str, int] = {}
+        # gender -> user_id -> (profile, trait bits, deal-breaker bits, stamp)
+        self._by_gender: Dict[str, Dict[str, Tuple[CompactProfile, int, int, int]]] = {}
+        # gender -> sorted (age, user_id), and the same per (gender, location)
+        self._by_age: Dict[str, List[Tuple[int, str]]] = {}
+        self._by_location: Dict[Tuple[str, str], List[Tuple[int, str]]] = {}
+        self._terms = TermBits()
+        # Every write takes the next value, so versions are never reused
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+    def __contains__(self, user_id: object) -> bool:
+        return user_id in self._profiles
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._profiles)
+
+    def __getitem__(self, user_id: str) -> CompactProfile:
+        return self._profiles[user_id]
+
+    def __setitem__(self, user_id: str, profile: UserProfile) -> None:
+        if user_id in self._profiles:
+            self._unindex(user_id)
+        compact = CompactProfile(profile, self.vocabulary)
+        self._profiles[user_id] = compact
+        self._index(user_id, compact)
+        self.version += 1
+        self._versions[user_id] = self.version
+
+    def __delitem__(self, user_id: str) -> None:
+        self._unindex(user_id)
+        del self._profiles[user_id]
+        del self._versions[user_id]
+        self.version += 1
+
+    def _entry(self, profile: CompactProfile) -> Tuple[CompactProfile, int, int, int]:
+        traits, _ = self._terms.compile(trait_keys(profile))
+        deal_breakers, _ = self._terms.compile(deal_breaker_keys(profile))
+        return profile, traits, deal_breakers, self._terms.stamp
+
+    def _index(self, user_id: str, profile: CompactProfile, keep_sorted: bool = True, add_terms: bool = True) -> None:
+        if add_terms:
+            self._terms.add(trait_keys(profile), deal_breaker_keys(profile))
+        self._by_gender.setdefault(profile.gender, {})[user_id] = self._entry(profile)
+        
+        key = (profile.age, user_id)
+        for ages in (
+            self._by_age.setdefault(profile.gender, []),
+            self._by_location.setdefault((profile.gender, location_key(profile.location)), [])
+        ):
+            if keep_sorted:
+                insort(ages, key)
+            else:
+                ages.append(key)
+
+    def _unindex(self, user_id: str) -> None:
+        profile = self._profiles[user_id]
+        self._terms.remove(trait_keys(profile), deal_breaker_keys(profile))
+        gender = profile.gender
+        bucket = self._by_gender[gender]
+        del bucket[user_id]
+        if not bucket:
+            del self._by_gender[gender]
+        
+        key = (profile.age, user_id)
+        _remove(self._by_age[gender], key)
+        if not bucket:
+            del self._by_age[gender]
+        location = (gender, location_key(profile.location))
+        _remove(self._by_location[location], key)
+        if not self._by_location[location]:
+            del self._by_location[location]
+
+    def rebuild_indexes(self) -> None:
+        """Rebuild the matching indexes from the stored profiles."""
+        self._by_gender = {}
+        self._by_age = {}
+        self._by_location = {}
+        self._terms = TermBits()
+        # Counting all terms first assigns every bit before any bitset is
+        # compiled, and sorting once at the end is much faster than
+        # inserting in order
+        for profile in self._profiles.values():
+            self._terms.add(trait_keys(profile), deal_breaker_keys(profile))
+        for user_id, profile in self._profiles.items():
+            self._index(user_id, profile, keep_sorted=False, add_terms=False)
+        for ages in chain(self._by_age.values(), self._by_location.values()):
+            ages.sort()
+
+    def export_state(self) -> Dict[str, Any]:
+        """Shallow-copy the store contents and indexes for a snapshot.
+
+        Compact profiles and index entries are never mutated in place, so
+        the copy stays consistent while it is serialized off the event
+        loop. Indexes are tagged with INDEX_LAYOUT, so a layout change does
+        not break existing snapshots.
+        """
+        return {
+            "vocabulary": dict(self.vocabulary._strings),
+            "profiles": dict(self._profiles),
+            "versions": dict(self._versions),
+            "version": self.version,
+            "indexes": {
+                "layout": INDEX_LAYOUT,
+                "by_gender": {gender: dict(bucket) for gender, bucket in self._by_gender.items()},
+                "by_age": {gender: list(ages) for gender, ages in self._by_age.items()},
+                "by_location": {key: list(ages) for key, ages in self._by_location.items()},
+                "terms": self._terms.export_state(),
+            },
+        }
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        """Replace the store contents with a previously exported state.
+
+        Indexes are taken from the state if they have the current layout,
+        which is about twice as fast as rebuilding them.
+        """
+        self.vocabulary._strings = state["vocabulary"]
+        self._profiles = state["profiles"]
+        self._versions = state["versions"]
+        self.version = state["version"]
+        indexes = state.get("indexes")
+        if indexes is None or indexes["layout"] != INDEX_LAYOUT:
+            self.rebuild_indexes()
+            return
+        self._by_gender = indexes["by_gender"]
+        self._by_age = indexes["by_age"]
+        self._by_location = indexes["by_location"]
+        self._terms = TermBits.from_state(indexes["terms"])
+
+    def get(self, user_id: str) -> Optional[CompactProfile]:
+        return self._profiles.get(user_id)
+
+    def items(self):
+        return self._profiles.items()
+
+    def profile_version(self, user_id: str) -> int:
+        """Get the version of a single profile."""
+        return self._versions[user_id]
+
+    def iter_candidates(
+        self,
+        user_id: str,
+        genders: Iterable[str],
+        min_age: Optional[int] = None,
+        max_age: Optional[int] = None,
+        location: Optional[str] = None
+    ) -> Iterator[Tuple[str, CompactProfile]]:
+        """Iterate over profiles of the given genders that pass the match filters.
+
+        A candidate is skipped if it has any of the user's deal-breakers as
+        a trait, or the user has any of the candidate's. Optional age bounds
+        are inclusive, and location must match exactly, ignoring case.
+        """
+        user = self._profiles[user_id]
+        user_traits, user_deal_breakers = trait_keys(user), deal_breaker_keys(user)
+        # Compiled now, so they hold every bit currently assigned
+        traits, traits_stamp = self._terms.compile(user_traits)
+        deal_breakers, deal_breakers_stamp = self._terms.compile(user_deal_breakers)
+        newest = max(traits_stamp, deal_breakers_stamp)
+        for gender in dict.fromkeys(genders):
+            bucket = self._by_gender.get(gender)
+            if not bucket:
+                continue
+            if location is not None:
+                ages = self._by_location.get((gender, location_key(location)), [])
+            elif min_age is not None or max_age is not None:
+                ages = self._by_age[gender]
+            else:
+                ages = None
+            entries = bucket.items() if ages is None else (
+                (candidate_id, bucket[candidate_id]) for candidate_id in _age_range(ages, min_age, max_age)
+            )
+            
+            for candidate_id, entry in entries:
+                if entry[3] < newest:
+                    # Compiled before some of the user's bits were assigned
+                    entry = bucket[candidate_id] = self._entry(entry[0])
+                profile, candidate_traits, candidate_deal_breakers, _ = entry
+                conflict = deal_breakers & candidate_traits
+                if conflict and (conflict != OVERFLOW_BIT or not user_deal_breakers.isdisjoint(trait_keys(profile))):
+                    continue
+                conflict = candidate_deal_breakers & traits
+                if conflict and (conflict != OVERFLOW_BIT or not user_traits.isdisjoint(deal_breaker_keys(profile))):
+                    continue
+                yield candidate_id, profile
@@ -0,0 +1,38 @@
+from fastapi import Request, Response
+from typing import Optional
+import uuid
+
+# Random per-process prefix so ETags from a previous worker never match
+BOOT_ID = uuid.uuid4().hex[:8]
+
+def make_etag(*parts) -> str:
+    """Build a strong ETag from version components."""
+    return '"' + "-".join([BOOT_ID, *(str(part) for part in parts)]) + '"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check whether the request's If-None-Match header matches the ETag."""
+    header: Optional[str] = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+
+    # If-None-Match uses weak comparison, so ignore any W/ prefix
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+def set_etag(response: Response, etag: str) -> None:
+    """Attach ETag and revalidation headers to a response."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+
+def not_modified(etag: str) -> Response:
+    """Build an empty 304 response for a matching ETag."""
+    response = Response(status_code=304)
+    set_etag(response, etag)
+    return response
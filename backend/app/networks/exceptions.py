@@ -35,5 +35,10 @@ class AuthenticationException(BaseAPIException):
 
 class RateLimitException(BaseAPIException):
     """Exception for rate limiting errors."""
-    def __init__(self, detail: str = "Rate limit exceeded", code: str = "RATE_LIMIT_ERROR"):
-        super().__init__(status_code=429, detail=detail, code=code)
\ No newline at end of file
+    def __init__(
+        self,
+        detail: str = "Rate limit exceeded",
+        code: str = "RATE_LIMIT_ERROR",
+        headers: Optional[dict[str, Any]] = None
+    ):
+        super().__init__(status_code=429, detail=detail, code=code, headers=headers)
\ No newline at end of file
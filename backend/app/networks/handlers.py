@@ -11,19 +11,21 @@ from .exceptions import (
     AuthenticationException,
     RateLimitException
 )
+from .responses import json_response
 
 async def base_exception_handler(
     request: Request,
     exc: BaseAPIException
 ) -> JSONResponse:
     """Handle custom API exceptions."""
-    return JSONResponse(
+    return json_response(
         status_code=exc.status_code,
         content={
             "detail": exc.detail,
             "code": exc.code,
             "timestamp": datetime.now().isoformat()
-        }
+        },
+        headers=exc.headers
     )
 
 async def general_exception_handler(
@@ -31,7 +33,7 @@ async def general_exception_handler(
     exc: Exception
 ) -> JSONResponse:
     """Handle unhandled exceptions."""
-    return JSONResponse(
+    return json_response(
         status_code=500,
         content={
             "detail": "An unexpected error occurred",
@@ -0,0 +1,69 @@
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+import json
+
+from ..config import get_settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+settings = get_settings()
+
+def _default(obj: Any) -> Any:
+    """Serialize types the JSON encoder does not handle natively."""
+    if isinstance(obj, BaseModel):
+        return obj.dict()
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+class FastJSONResponse(JSONResponse):
+    """JSON response serialized in one pass, with orjson when installed.
+
+    Unlike FastAPI's default path there is no jsonable_encoder walk over
+    the content, so it is only meant for data that is already valid.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(
+            content,
+            default=_default,
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":")
+        ).encode("utf-8")
+
+def json_response(
+    content: Any,
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None
+) -> JSONResponse:
+    """Build a JSON response using the configured serialization mode."""
+    if settings.FAST_JSON_RESPONSES:
+        return FastJSONResponse(content, status_code=status_code, headers=headers)
+    return JSONResponse(jsonable_encoder(content), status_code=status_code, headers=headers)
+
+def fast_response(content: Any, response: Optional[Response] = None) -> Any:
+    """Return route content, pre-serialized when fast responses are enabled.
+
+    In fast mode the route's response_model is not re-validated, so content
+    must already match it. Headers set on the injected `response` are
+    carried over. Otherwise the content is returned unchanged for FastAPI
+    to validate and encode as usual.
+    """
+    if not settings.FAST_JSON_RESPONSES:
+        return content
+    fast = FastJSONResponse(content)
+    if response is not None:
+        fast.raw_headers.extend(response.raw_headers)
+    return fast
@@ -0,0 +1,124 @@
+"""On-demand statistical profiler for backend requests.
+
+A background thread samples the Python stack of the thread serving a
+profiled request at a fixed interval. Samples are kept per request in
+collapsed-stack form ("outer;inner;leaf count") ready for flamegraph
+tools, and finished profiles go into a bounded ring buffer.
+
+Requests share the event loop thread, so a profile covers everything the
+loop ran while the request was in flight, not only that request's own
+coroutine.
+"""
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional
+import sys
+import threading
+import time
+
+from .config import get_settings
+
+MAX_STACK_DEPTH = 128
+
+@dataclass
+class RequestProfile:
+    """Stack samples collected while one request was in flight."""
+    method: str
+    route: str
+    thread_id: int
+    started: float = field(default_factory=time.time)
+    duration: float = 0.0
+    stacks: Counter = field(default_factory=Counter)
+
+def collapse_stack(frame) -> str:
+    """Render a frame and its callers as a root-first collapsed stack."""
+    names: List[str] = []
+    while frame is not None and len(names) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        # co_qualname is new in Python 3.11
+        name = getattr(code, "co_qualname", code.co_name)
+        names.append(f"{frame.f_globals.get('__name__', '?')}:{name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+class StackSampler:
+    """Samples the stacks of threads with active profiles."""
+
+    def __init__(self, interval: float, buffer_size: int):
+        self.interval = interval
+        self.profiles: Deque[RequestProfile] = deque(maxlen=buffer_size)
+        self._active: Dict[int, RequestProfile] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start_profile(self, method: str, route: str) -> RequestProfile:
+        """Start sampling the current thread for a request."""
+        profile = RequestProfile(method=method, route=route, thread_id=threading.get_ident())
+        with self._lock:
+            self._active[id(profile)] = profile
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="stack-sampler", daemon=True
+                )
+                self._thread.start()
+        self._wake.set()
+        return profile
+
+    def finish_profile(self, profile: RequestProfile, route: Optional[str] = None) -> None:
+        """Stop sampling a request and keep its profile."""
+        with self._lock:
+            self._active.pop(id(profile), None)
+            if not self._active:
+                self._wake.clear()
+        profile.duration = time.time() - profile.started
+        if route:
+            profile.route = route
+        self.profiles.append(profile)
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while True:
+            self._wake.wait()
+            time.sleep(self.interval)
+            frames = sys._current_frames()
+            with self._lock:
+                thread_ids = {profile.thread_id for profile in self._active.values()}
+            # Collapse each sampled thread once, outside the lock
+            stacks = {
+                thread_id: collapse_stack(frames[thread_id])
+                for thread_id in thread_ids
+                if thread_id != own_id and thread_id in frames
+            }
+            # Count only for profiles still active: finished ones are in the
+            # ring buffer, where readers iterate them without the lock
+            with self._lock:
+                for profile in self._active.values():
+                    stack = stacks.get(profile.thread_id)
+                    if stack is not None:
+                        profile.stacks[stack] += 1
+
+    def collapsed(self, route: Optional[str] = None) -> str:
+        """Aggregate buffered profiles into collapsed-stack text."""
+        totals: Counter = Counter()
+        for profile in list(self.profiles):
+            if route is None or profile.route == route:
+                totals.update(profile.stacks)
+        return "".join(f"{stack} {count}\n" for stack, count in totals.most_common())
+
+    def summary(self) -> List[Dict]:
+        """Describe buffered profiles, aggregated per route."""
+        routes: Dict[str, Dict] = {}
+        for profile in list(self.profiles):
+            key = f"{profile.method} {profile.route}"
+            entry = routes.setdefault(
+                key, {"route": profile.route, "method": profile.method, "requests": 0,
+                      "samples": 0, "total_seconds": 0.0}
+            )
+            entry["requests"] += 1
+            entry["samples"] += sum(profile.stacks.values())
+            entry["total_seconds"] += profile.duration
+        return list(routes.values())
+
+settings = get_settings()
+sampler = StackSampler(settings.PROFILING_INTERVAL_MS / 1000, settings.PROFILING_BUFFER_SIZE)
@@ -0,0 +1,151 @@
+from collections import OrderedDict
+from typing import Dict, List, Mapping, NamedTuple, Optional, Tuple
+import math
+import time
+
+class RateLimitResult(NamedTuple):
+    """Outcome of a rate limit check."""
+    allowed: bool
+    limit: int
+    remaining: int
+    # Seconds until the request would be allowed (0 when allowed) or,
+    # for allowed requests, until the current window rolls over
+    reset_after: float
+
+class SlidingWindowLimiter:
+    """Sliding-window-counter rate limiter.
+
+    Each key keeps only the request count of the current and previous
+    fixed windows. The previous count is weighted by how much of it still
+    overlaps the sliding window, which gives a close estimate of the
+    requests made in the last `period` seconds in O(1) time and constant
+    memory per key.
+
+    Keys are kept in least-recently-used order so idle keys can be evicted
+    from the front as soon as neither window can affect them any more.
+    """
+
+    def __init__(self, limit: int, period: float):
+        self.limit = limit
+        self.period = period
+        # key -> [window_start, current_count, previous_count]
+        self.store: "OrderedDict[str, List[float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def hit(self, key: str, cost: float = 1, now: Optional[float] = None) -> RateLimitResult:
+        """Record a request for key and report whether it is allowed."""
+        if now is None:
+            now = time.monotonic()
+        period = self.period
+        window_start = now - now % period
+
+        entry = self.store.get(key)
+        if entry is None:
+            entry = self.store[key] = [window_start, 0, 0]
+        else:
+            self.store.move_to_end(key)
+            if entry[0] != window_start:
+                # Roll forward: the old current window becomes the previous
+                # one, unless more than one window has passed.
+                entry[2] = entry[1] if entry[0] == window_start - period else 0
+                entry[1] = 0
+                entry[0] = window_start
+        self._evict(now)
+
+        elapsed = now - window_start
+        previous_weight = entry[2] * (1 - elapsed / period)
+        used = previous_weight + entry[1]
+
+        if used + cost > self.limit:
+            return RateLimitResult(False, self.limit, 0, self._retry_after(entry, cost, elapsed))
+
+        entry[1] += cost
+        remaining = max(0, math.floor(self.limit - used - cost))
+        return RateLimitResult(True, self.limit, remaining, period - elapsed)
+
+    def charge(self, key: str, cost: float, now: Optional[float] = None) -> None:
+        """Add cost for key after the fact, even if it goes over the limit."""
+        if not self.hit(key, cost, now).allowed:
+            self.store[key][1] += cost
+
+    def _retry_after(self, entry: List[float], cost: float, elapsed: float) -> float:
+        period = self.period
+        room = self.limit - entry[1] - cost
+        if room >= 0 and entry[2] > 0:
+            # Wait for enough of the previous window to slide out
+            return max(0.0, period * (1 - room / entry[2]) - elapsed)
+        # The current window alone is over the limit; wait for it to end
+        return period - elapsed
+
+    def _evict(self, now: float) -> None:
+        # Windows older than two periods no longer carry any weight
+        cutoff = now - 2 * self.period
+        store = self.store
+        while store:
+            key = next(iter(store))
+            if store[key][0] > cutoff:
+                break
+            del store[key]
+
+DEFAULT_COST_CLASS = "default"
+
+class CostRateLimiter:
+    """Route-aware limiter with a separate budget per cost class.
+
+    Routes are mapped to a cost class and weight by the longest matching
+    "METHOD /path/prefix" rule; unmatched routes cost 1 from the default
+    class. If a "<class>_tokens" budget is configured, requests in that
+    class are also charged the LLM tokens they report after the response.
+    """
+
+    def __init__(
+        self,
+        budgets: Mapping[str, int],
+        period: float,
+        route_costs: Mapping[str, Tuple[str, float]]
+    ):
+        if DEFAULT_COST_CLASS not in budgets:
+            raise ValueError(f"A budget for the {DEFAULT_COST_CLASS!r} cost class is required")
+        self.limiters: Dict[str, SlidingWindowLimiter] = {
+            name: SlidingWindowLimiter(limit, period) for name, limit in budgets.items()
+        }
+
+        self._rules: List[Tuple[str, str, str, float]] = []
+        for rule, (cost_class, weight) in route_costs.items():
+            if cost_class not in self.limiters:
+                raise ValueError(f"Route cost {rule!r} uses unknown cost class {cost_class!r}")
+            method, _, prefix = rule.partition(" ")
+            self._rules.append((method.upper(), prefix, cost_class, weight))
+        self._rules.sort(key=lambda rule: len(rule[1]), reverse=True)
+
+    def route_cost(self, method: str, path: str) -> Tuple[str, float]:
+        """Get the cost class and weight of a request."""
+        for rule_method, prefix, cost_class, weight in self._rules:
+            if (rule_method == method or rule_method == "*") and (
+                path == prefix or path.startswith(prefix.rstrip("/") + "/")
+            ):
+                return cost_class, weight
+        return DEFAULT_COST_CLASS, 1
+
+    def token_class(self, cost_class: str) -> Optional[str]:
+        """Get the token budget class for a cost class, if one is configured."""
+        name = f"{cost_class}_tokens"
+        return name if name in self.limiters else None
+
+    def hit(self, key: str, cost_class: str = DEFAULT_COST_CLASS, cost: float = 1) -> RateLimitResult:
+        """Charge a request against the budget of its cost class."""
+        token_class = self.token_class(cost_class)
+        if token_class:
+            # Refuse new LLM calls once the token budget is spent
+            tokens = self.limiters[token_class].hit(key, 0)
+            if not tokens.allowed:
+                return tokens
+        return self.limiters[cost_class].hit(key, cost)
+
+    def charge_tokens(self, key: str, cost_class: str, tokens: int) -> None:
+        """Charge tokens used by a completed request."""
+        token_class = self.token_class(cost_class)
+        if token_class and tokens:
+            self.limiters[token_class].charge(key, tokens)
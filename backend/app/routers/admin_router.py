@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import PlainTextResponse
+from typing import Dict, List, Optional
+import secrets
+
+from ..config import get_settings
+from ..networks.exceptions import AuthenticationException
+from ..profiling import sampler
+
+router = APIRouter(prefix="/admin", tags=["admin"], include_in_schema=False)
+settings = get_settings()
+
+async def verify_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Require the configured admin token."""
+    expected = settings.ADMIN_TOKEN.get_secret_value() if settings.ADMIN_TOKEN else ""
+    if (
+        not expected
+        or x_admin_token is None
+        or not secrets.compare_digest(x_admin_token.encode(), expected.encode())
+    ):
+        raise AuthenticationException("Admin token required")
+
+@router.get("/profiles", dependencies=[Depends(verify_admin)])
+async def list_profiles() -> List[Dict]:
+    """Summarize buffered request profiles per route."""
+    return sampler.summary()
+
+@router.get(
+    "/profiles/collapsed",
+    response_class=PlainTextResponse,
+    dependencies=[Depends(verify_admin)]
+)
+async def download_profiles(route: Optional[str] = None) -> str:
+    """Download buffered profiles in collapsed-stack format for flamegraphs."""
+    return sampler.collapsed(route)
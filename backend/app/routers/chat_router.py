@@ -1,38 +1,118 @@
-from fastapi import APIRouter, Depends
-from typing import Dict
-from ..models.schemas import ChatRequest, ChatResponse, ChatMessage
+from fastapi import APIRouter, Depends, Request
+from typing import Dict, Optional
+from ..models.schemas import ChatRequest, ChatResponse
 from ..models.chat import ChatState
 from ..networks.exceptions import ChatException
+from ..networks.responses import fast_response
 from ..config import get_settings
 from ..dependencies import common_params
-import httpx
+from .. import metrics
+from ..tracing import span
+import json
+import time
 from datetime import datetime
 
 router = APIRouter(prefix="/api/chat", tags=["chat"])
 settings = get_settings()
 
+GROQ_MODEL = settings.GROQ_MODEL
+GROQ_API_URL = settings.GROQ_API_BASE_URL.rstrip("/") + "/chat/completions"
+
 # In-memory storage for chat states
 chat_states: Dict[str, ChatState] = {}
 
-async def get_groq_response(messages: list, api_key: str) -> str:
-    """Get response from Groq API."""
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(
-                "https://api.groq.com/v1/chat/completions",
-                headers={"Authorization": f"Bearer {api_key}"},
-                json={
-                    "model": "mixtral-8x7b-32768",
-                    "messages": messages,
-                    "temperature": 0.7,
-                    "max_tokens": 4096
-                },
-                timeout=30.0
-            )
+# Shared client, so LLM calls reuse pooled keep-alive connections
+_http_client = None
+
+def get_http_client():
+    """Get the shared HTTP client for LLM calls, creating it on first use."""
+    global _http_client
+    if _http_client is None:
+        # Imported on first use to keep httpx out of startup time
+        import httpx
+        
+        _http_client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        )
+    return _http_client
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and its pooled connections."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+async def warm_up_connection() -> None:
+    """Open a pooled connection to the LLM API ahead of the first chat.
+
+    Any response will do: once DNS, TCP and TLS are done the connection
+    goes back to the pool for the next request.
+    """
+    await get_http_client().head(GROQ_API_URL, timeout=5.0)
+
+async def get_groq_response(
+    messages: list,
+    api_key: str,
+    usage: Optional[Dict[str, int]] = None
+) -> str:
+    """Get response from Groq API.
+
+    The reply is streamed, so time to first token is measured when the
+    first content delta arrives. If a usage dict is passed it is filled
+    with the token counts reported by the API.
+    """
+    model = GROQ_MODEL
+    started = time.perf_counter()
+    client = get_http_client()
+    try:
+        async with client.stream(
+            "POST",
+            GROQ_API_URL,
+            headers={"Authorization": f"Bearer {api_key}"},
+            json={
+                "model": model,
+                "messages": messages,
+                "temperature": 0.7,
+                "max_tokens": 4096,
+                "stream": True,
+                "stream_options": {"include_usage": True}
+            },
+            timeout=30.0
+        ) as response:
             response.raise_for_status()
-            return response.json()["choices"][0]["message"]["content"]
-        except Exception as e:
-            raise ChatException(f"Failed to get response from Groq: {str(e)}")
+            parts = []
+            token_usage = {}
+            # Server-sent events: "data: <json chunk>" lines, then "data: [DONE]"
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                payload = line[5:].strip()
+                if payload == "[DONE]":
+                    break
+                chunk = json.loads(payload)
+                for choice in chunk.get("choices") or ():
+                    delta = (choice.get("delta") or {}).get("content")
+                    if delta:
+                        if not parts:
+                            metrics.LLM_TIME_TO_FIRST_TOKEN.labels(model).observe(
+                                time.perf_counter() - started
+                            )
+                        parts.append(delta)
+                # Usage comes in the last chunk; Groq also reports it under x_groq
+                token_usage = chunk.get("usage") or (chunk.get("x_groq") or {}).get("usage") or token_usage
+        content = "".join(parts)
+    except Exception as e:
+        metrics.LLM_ERRORS.labels(model).inc()
+        raise ChatException(f"Failed to get response from Groq: {str(e)}")
+
+    metrics.LLM_LATENCY.labels(model).observe(time.perf_counter() - started)
+    metrics.LLM_TOKENS.labels(model, "prompt").inc(token_usage.get("prompt_tokens", 0))
+    metrics.LLM_TOKENS.labels(model, "completion").inc(token_usage.get("completion_tokens", 0))
+    if usage is not None:
+        usage.update(token_usage)
+    return content
 
 def get_chat_state(user_id: str) -> ChatState:
     """Get or create chat state for user."""
@@ -40,62 +120,67 @@ def get_chat_state(user_id: str) -> ChatState:
         chat_states[user_id] = ChatState(user_id=user_id)
     return chat_states[user_id]
 
+async def run_chat_turn(
+    user_id: str,
+    message: str,
+    system_prompt: str,
+    http_request: Request
+):
+    """Run one chat turn: store the message, ask the LLM and build the response."""
+    with span("chat_state"):
+        chat_state = get_chat_state(user_id)
+        # Add user message to history
+        chat_state.add_message("user", message)
+    
+    with span("assemble_messages"):
+        # The API only accepts role and content; stored messages also carry
+        # a timestamp that is not JSON serializable
+        messages = [{"role": "system", "content": system_prompt}] + [
+            {"role": m["role"], "content": m["content"]} for m in chat_state.get_messages()
+        ]
+    
+    # Get response from Groq, reporting token usage for rate limiting
+    usage: Dict[str, int] = {}
+    with span("llm"):
+        response = await get_groq_response(
+            messages, settings.GROQ_API_KEY.get_secret_value(), usage
+        )
+    http_request.state.llm_tokens = usage.get("total_tokens", 0)
+    
+    with span("build_response"):
+        # Add AI response to history
+        chat_state.add_message("assistant", response)
+        
+        # Stored messages already have the ChatMessage fields
+        return fast_response({
+            "message": response,
+            "chat_history": chat_state.get_messages()
+        })
+
 @router.post("/advisor", response_model=ChatResponse)
 async def chat_with_advisor(
     request: ChatRequest,
+    http_request: Request,
     commons: Dict = Depends(common_params)
 ) -> ChatResponse:
     """Chat with the dating advisor AI."""
-    chat_state = get_chat_state(commons["user_id"])
-    
-    # Add user message to history
-    chat_state.add_message("user", request.message)
-    
-    # Prepare context for advisor mode
-    system_message = {
-        "role": "system",
-        "content": "You are an expert dating advisor helping users navigate relationships and dating."
-    }
-    
-    messages = [system_message] + chat_state.get_messages()
-    
-    # Get response from Groq
-    response = await get_groq_response(messages, settings.GROQ_API_KEY.get_secret_value())
-    
-    # Add AI response to history
-    chat_state.add_message("assistant", response)
-    
-    return ChatResponse(
-        message=response,
-        chat_history=[ChatMessage(**msg) for msg in chat_state.get_messages()]
+    return await run_chat_turn(
+        commons["user_id"],
+        request.message,
+        "You are an expert dating advisor helping users navigate relationships and dating.",
+        http_request
     )
 
 @router.post("/partner", response_model=ChatResponse)
 async def chat_with_partner(
     request: ChatRequest,
+    http_request: Request,
     commons: Dict = Depends(common_params)
 ) -> ChatResponse:
     """Chat with an AI simulating a potential dating partner."""
-    chat_state = get_chat_state(commons["user_id"])
-    
-    # Add user message to history
-    chat_state.add_message("user", request.message)
-    
-    # Prepare context for partner mode
-    system_message = {
-        "role": "system",
-        "content": "You are simulating a potential dating partner engaging in conversation."
-    }
-    
-    messages = [system_message] + chat_state.get_messages()
-    
-    # Get response from Groq
-    response = await get_groq_response(messages, settings.GROQ_API_KEY.get_secret_value())
-    
-    # Add AI response to history
-    chat_state.add_message("assistant", response)
-    
-    return ChatResponse(
-        message=response,
-        chat_history=[ChatMessage(**msg) for msg in chat_state.get_messages()]
-    )
\ No newline at end of file
+    return await run_chat_turn(
+        commons["user_id"],
+        request.message,
+        "You are simulating a potential dating partner engaging in conversation.",
+        http_request
+    )
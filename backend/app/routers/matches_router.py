@@ -1,9 +1,13 @@
-from fastapi import APIRouter, Depends
-from typing import List, Dict
+from fastapi import APIRouter, Depends, Request, Response
+from typing import List, Dict, Optional
 from ..models.schemas import UserProfile
 from ..networks.exceptions import ProfileException
+from ..networks.etags import make_etag, etag_matches, set_etag, not_modified
+from ..networks.responses import fast_response
 from ..dependencies import common_params
 from .profile_router import profiles
+from .. import metrics
+import time
 
 router = APIRouter(prefix="/api/matches", tags=["matches"])
 
@@ -45,28 +49,55 @@ def calculate_match_score(user_profile: UserProfile, potential_match: UserProfil
 @router.get("/{user_id}", response_model=List[Dict])
 async def get_matches(
     user_id: str,
+    request: Request,
+    response: Response,
     min_score: float = 50.0,
     limit: int = 10,
+    min_age: Optional[int] = None,
+    max_age: Optional[int] = None,
+    location: Optional[str] = None,
     commons: Dict = Depends(common_params)
 ) -> List[Dict]:
-    """Get potential matches for a user."""
+    """Get potential matches for a user.
+
+    Candidates can be narrowed to an inclusive age range and a location
+    before they are scored.
+    """
     # Verify user can only get their own matches
     if user_id != commons["user_id"]:
         raise ProfileException("You can only get matches for your own profile")
     
     if user_id not in profiles:
         raise ProfileException(f"Profile not found for user {user_id}")
+
+    # Matches depend on every stored profile, so use the combined version
+    etag = make_etag(profiles.version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     
     user_profile = profiles[user_id]
     matches = []
+    scanned = 0
+    started = time.perf_counter()
     
-    for match_id, match_profile in profiles.items():
+    # Only scan candidates whose gender is in user's interested_in list, who
+    # pass the deal-breaker filter in both directions and are in the
+    # requested age range and location (blank means any)
+    candidates = profiles.iter_candidates(
+        user_id,
+        user_profile.interested_in,
+        min_age=min_age,
+        max_age=max_age,
+        location=(location or "").strip() or None
+    )
+    for match_id, match_profile in candidates:
+        scanned += 1
         if match_id == user_id:
             continue
             
-        # Check if the match's gender is in user's interested_in list
-        if (match_profile.gender not in user_profile.interested_in or 
-            user_profile.gender not in match_profile.interested_in):
+        # Check the match is interested in the user's gender too
+        if user_profile.gender not in match_profile.interested_in:
             continue
             
         # Calculate match score
@@ -74,7 +105,7 @@ async def get_matches(
         
         if score >= min_score:
             # Filter out sensitive information
-            safe_profile = match_profile.dict(
+            safe_profile = match_profile.to_dict(
                 exclude={'deal_breakers', 'values'}
             )
             matches.append({
@@ -83,6 +114,9 @@ async def get_matches(
                 "match_score": round(score, 2)
             })
     
+    metrics.MATCH_SCAN_SIZE.observe(scanned)
+    metrics.MATCH_SCAN_LATENCY.observe(time.perf_counter() - started)
+    
     # Sort matches by score and limit results
     matches.sort(key=lambda x: x["match_score"], reverse=True)
-    return matches[:limit]
\ No newline at end of file
+    return fast_response(matches[:limit], response)
\ No newline at end of file
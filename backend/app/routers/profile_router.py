@@ -1,17 +1,22 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from typing import Dict
 from ..models.schemas import UserProfile
+from ..models.profile_store import ProfileStore
 from ..networks.exceptions import ProfileException
+from ..networks.etags import make_etag, etag_matches, set_etag, not_modified
+from ..networks.responses import fast_response
 from ..dependencies import common_params
 
 router = APIRouter(prefix="/api/profile", tags=["profile"])
 
-# In-memory storage for user profiles
-profiles: Dict[str, UserProfile] = {}
+# In-memory storage for user profiles, kept in compact form
+profiles = ProfileStore()
 
 @router.get("/{user_id}", response_model=UserProfile)
 async def get_profile(
     user_id: str,
+    request: Request,
+    response: Response,
     commons: Dict = Depends(common_params)
 ) -> UserProfile:
     """Get user profile by ID."""
@@ -21,12 +26,18 @@ async def get_profile(
         
     if user_id not in profiles:
         raise ProfileException(f"Profile not found for user {user_id}")
-    return profiles[user_id]
+
+    etag = make_etag(profiles.profile_version(user_id))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    return fast_response(profiles[user_id].to_dict(), response)
 
 @router.put("/{user_id}", response_model=UserProfile)
 async def update_profile(
     user_id: str,
     profile: UserProfile,
+    response: Response,
     commons: Dict = Depends(common_params)
 ) -> UserProfile:
     """Update or create user profile."""
@@ -35,7 +46,8 @@ async def update_profile(
         raise ProfileException("You can only update your own profile")
         
     profiles[user_id] = profile
-    return profile
+    set_etag(response, make_etag(profiles.profile_version(user_id)))
+    return fast_response(profile, response)
 
 @router.delete("/{user_id}")
 async def delete_profile(
@@ -50,4 +62,4 @@ async def delete_profile(
     if user_id not in profiles:
         raise ProfileException(f"Profile not found for user {user_id}")
     del profiles[user_id]
-    return {"message": "Profile deleted successfully"}
\ No newline at end of file
+    return {"message": "Profile deleted successfully"}
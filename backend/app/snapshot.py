@@ -0,0 +1,182 @@
+import asyncio
+import hashlib
+import logging
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+import time
+from dataclasses import fields, replace
+from typing import Dict, Optional
+
+from .models.chat import ChatState
+from .models.profile_store import CompactProfile, ProfileStore
+from .models.schemas import UserProfile
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b"DMSNAP"
+SNAPSHOT_FORMAT_VERSION = 2
+
+# magic, format version; read first, since the rest of the header has
+# changed between versions
+_PREFIX = struct.Struct("<6sH")
+# magic, format version, schema digest, created-at timestamp, payload length
+_HEADER = struct.Struct("<6sH8sdQ")
+
+# Chat states copied per event loop turn while capturing
+CAPTURE_CHUNK_SIZE = 1000
+
+# Periodic and shutdown saves must not write concurrently
+_save_lock = asyncio.Lock()
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is missing, corrupt or incompatible."""
+
+def state_schema() -> bytes:
+    """Digest of the object layouts stored in snapshots.
+
+    Compact profiles are pickled positionally over their slots, so a
+    snapshot is only loadable by code with the same slots. Any change to
+    them, to UserProfile or to ChatState changes the digest.
+    """
+    layout = repr((
+        CompactProfile.__slots__,
+        tuple(UserProfile.__fields__),
+        tuple(f.name for f in fields(ChatState)),
+    ))
+    return hashlib.sha256(layout.encode()).digest()[:8]
+
+async def capture_state(profiles: ProfileStore, chat_states: Dict[str, ChatState]) -> Dict:
+    """Take a shallow copy of the backend state without blocking the loop for long.
+
+    Must run on the event loop thread. The profile store is copied in one
+    step, so it stays consistent with itself. Chat states are copied
+    CAPTURE_CHUNK_SIZE at a time, yielding to the loop in between; each
+    is consistent on its own, and chats started meanwhile are left to the
+    next snapshot. Serializing the copy can then happen in a worker
+    thread while requests keep mutating the originals.
+    """
+    copies: Dict[str, ChatState] = {}
+    state = {"profiles": profiles.export_state(), "chat_states": copies}
+    user_ids = list(chat_states)
+    for start in range(0, len(user_ids), CAPTURE_CHUNK_SIZE):
+        await asyncio.sleep(0)
+        for user_id in user_ids[start:start + CAPTURE_CHUNK_SIZE]:
+            chat = chat_states.get(user_id)
+            if chat is not None:
+                copies[user_id] = replace(chat, messages=list(chat.messages), context=dict(chat.context))
+    return state
+
+def write_snapshot(path: str, state: Dict) -> int:
+    """Serialize captured state to path atomically and return its size."""
+    payload = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+    header = _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, state_schema(), time.time(), len(payload))
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # A unique temporary file in the same directory, so os.replace is atomic
+    fd, tmp_path = tempfile.mkstemp(prefix=f"{os.path.basename(path)}.", suffix=".tmp", dir=directory or ".")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return len(header) + len(payload)
+
+def read_snapshot(path: str) -> Dict:
+    """Load a snapshot file through a read-only memory map."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if len(mm) < _PREFIX.size:
+            raise SnapshotError(f"Snapshot {path} is truncated")
+        magic, version = _PREFIX.unpack_from(mm)
+        if magic != SNAPSHOT_MAGIC:
+            raise SnapshotError(f"{path} is not a snapshot file")
+        if version != SNAPSHOT_FORMAT_VERSION:
+            raise SnapshotError(f"Unsupported snapshot format version {version}")
+        if len(mm) < _HEADER.size:
+            raise SnapshotError(f"Snapshot {path} is truncated")
+        _, _, schema, _, length = _HEADER.unpack_from(mm)
+        if schema != state_schema():
+            raise SnapshotError(f"Snapshot {path} was written with different profile or chat fields")
+        if len(mm) - _HEADER.size != length:
+            raise SnapshotError(f"Snapshot {path} is truncated")
+
+        # Unpickle straight from the mapped pages without copying the file.
+        # Views must be released before the map is closed.
+        with memoryview(mm) as view, view[_HEADER.size:] as payload:
+            return pickle.loads(payload)
+
+def restore(path: str, profiles: ProfileStore, chat_states: Dict[str, ChatState]) -> bool:
+    """Restore backend state from a snapshot file if one exists."""
+    if not os.path.exists(path):
+        return False
+
+    started = time.perf_counter()
+    try:
+        state = read_snapshot(path)
+    except (OSError, ValueError, EOFError, SnapshotError, pickle.UnpicklingError) as e:
+        logger.warning("Ignoring unreadable snapshot %s: %s", path, e)
+        return False
+
+    profiles.load_state(state["profiles"])
+    chat_states.clear()
+    chat_states.update(state["chat_states"])
+    logger.info(
+        "Restored %d profiles and %d chat states from %s in %.1f ms",
+        len(profiles), len(chat_states), path, (time.perf_counter() - started) * 1000
+    )
+    return True
+
+async def save(path: str, profiles: ProfileStore, chat_states: Dict[str, ChatState]) -> None:
+    """Snapshot backend state without blocking the event loop on disk I/O.
+
+    Saves run one at a time. If the caller is cancelled, the write in
+    progress still completes before the next save can start.
+    """
+    async with _save_lock:
+        started = time.perf_counter()
+        state = await capture_state(profiles, chat_states)
+        captured = time.perf_counter()
+        write = asyncio.ensure_future(asyncio.to_thread(write_snapshot, path, state))
+        try:
+            size = await asyncio.shield(write)
+        except asyncio.CancelledError:
+            await write
+            raise
+    logger.info(
+        "Wrote snapshot %s (%d bytes): capture %.1f ms, write %.1f ms",
+        path, size, (captured - started) * 1000, (time.perf_counter() - captured) * 1000
+    )
+
+async def run_periodic(
+    path: str,
+    interval: float,
+    profiles: ProfileStore,
+    chat_states: Dict[str, ChatState]
+) -> None:
+    """Write a snapshot every `interval` seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await save(path, profiles, chat_states)
+        except Exception:
+            logger.exception("Failed to write snapshot %s", path)
+
+def start_periodic(
+    path: str,
+    interval: float,
+    profiles: ProfileStore,
+    chat_states: Dict[str, ChatState]
+) -> Optional[asyncio.Task]:
+    """Start the periodic snapshot task if snapshots are enabled."""
+    if not path or interval <= 0:
+        return None
+    return asyncio.create_task(run_periodic(path, interval, profiles, chat_states))
@@ -0,0 +1,167 @@
+"""Lightweight in-process request tracing.
+
+The current trace lives in a context variable, so code anywhere below the
+tracing middleware can time a stage with `with span("name"):` without
+passing the trace around. Spans are a flat list of named durations, which
+is enough to break a request down by stage and cheap enough to leave on.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional
+import json
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class Span:
+    """A named stage of a request."""
+    name: str
+    start: float
+    duration: float = 0.0
+
+@dataclass
+class Trace:
+    """Spans recorded while handling one request."""
+    request_id: str
+    method: str
+    path: str
+    started: float = field(default_factory=time.perf_counter)
+    timestamp: float = field(default_factory=time.time)
+    duration: float = 0.0
+    route: Optional[str] = None
+    status: Optional[int] = None
+    spans: List[Span] = field(default_factory=list)
+
+    def finish(self) -> None:
+        self.duration = time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        """Render spans as a Server-Timing header value."""
+        now = time.perf_counter()
+        parts = [f"{s.name};dur={s.duration * 1000:.2f}" for s in self.spans]
+        parts.append(f"total;dur={(now - self.started) * 1000:.2f}")
+        return ", ".join(parts)
+
+    def to_dict(self) -> dict:
+        return {
+            "request_id": self.request_id,
+            "timestamp": self.timestamp,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status": self.status,
+            "duration_ms": round(self.duration * 1000, 3),
+            "spans": [
+                {
+                    "name": s.name,
+                    "offset_ms": round((s.start - self.started) * 1000, 3),
+                    "duration_ms": round(s.duration * 1000, 3),
+                }
+                for s in self.spans
+            ],
+        }
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+
+def start_trace(request_id: str, method: str, path: str) -> Trace:
+    """Start a trace and make it current for this context."""
+    trace = Trace(request_id=request_id, method=method, path=path)
+    _current_trace.set(trace)
+    return trace
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+def current_request_id() -> Optional[str]:
+    trace = _current_trace.get()
+    return trace.request_id if trace is not None else None
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time a block as a span of the current trace, if there is one."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    record = Span(name=name, start=time.perf_counter())
+    try:
+        yield
+    finally:
+        record.duration = time.perf_counter() - record.start
+        trace.spans.append(record)
+
+def install_log_context() -> None:
+    """Add the current request id to every log record as `request_id`.
+
+    Log formats can then include `%(request_id)s`; it is "-" outside a request.
+    """
+    factory = logging.getLogRecordFactory()
+    if getattr(factory, "adds_request_id", False):
+        return
+
+    def record_factory(*args, **kwargs) -> logging.LogRecord:
+        record = factory(*args, **kwargs)
+        record.request_id = current_request_id() or "-"
+        return record
+
+    record_factory.adds_request_id = True
+    logging.setLogRecordFactory(record_factory)
+
+LOG_FORMAT = "%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s"
+
+def install_log_handler(name: str, level: str) -> None:
+    """Log `name` and its child loggers to stderr, with the request id.
+
+    Only that logger is configured; the root and library loggers keep the
+    deployment's settings. Records do not propagate, so a root handler
+    does not print them twice. Does nothing if the logger already has
+    handlers, e.g. from a uvicorn --log-config file.
+    """
+    target = logging.getLogger(name)
+    if target.handlers:
+        return
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    target.addHandler(handler)
+    target.setLevel(level.upper())
+    target.propagate = False
+
+class TraceExporter:
+    """Appends finished traces to a JSONL file from a background thread."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._queue: "queue.SimpleQueue[Trace]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def export(self, trace: Trace) -> None:
+        """Queue a trace for writing without blocking the event loop."""
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="trace-exporter", daemon=True
+                    )
+                    self._thread.start()
+        self._queue.put(trace)
+
+    def _run(self) -> None:
+        while True:
+            traces = [self._queue.get()]
+            # Write whatever else has queued up in the same batch
+            while True:
+                try:
+                    traces.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.writelines(json.dumps(t.to_dict()) + "\n" for t in traces)
+            except OSError as e:
+                logger.warning("Failed to export %d traces to %s: %s", len(traces), self.path, e)
@@ -0,0 +1,41 @@
+"""Measure per-request auth overhead of get_current_user with and without
+the verified token cache.
+
+Run from the backend directory:
+
+    python -m benchmarks.auth_overhead --calls 20000
+"""
+import argparse
+import asyncio
+import time
+
+from app import dependencies
+from app.dependencies import create_access_token, get_current_user
+
+async def measure(token: str, calls: int) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        await get_current_user(token)
+    return (time.perf_counter() - started) / calls
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=20_000)
+    args = parser.parse_args()
+
+    token = create_access_token({"sub": "bench-user"})
+    cache = dependencies.token_cache
+
+    cache.max_size = 0
+    cache.clear()
+    uncached = asyncio.run(measure(token, args.calls))
+
+    cache.max_size = 10_000
+    cached = asyncio.run(measure(token, args.calls))
+
+    print(f"{'get_current_user':<18} {'us/call':>8}")
+    print(f"{'without cache':<18} {uncached * 1e6:>8.1f}")
+    print(f"{'with cache':<18} {cached * 1e6:>8.1f} ({uncached / cached:.0f}x faster)")
+
+if __name__ == "__main__":
+    main()
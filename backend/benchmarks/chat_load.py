@@ -0,0 +1,272 @@
+"""Load-test the chat routes with simulated multi-turn users.
+
+By default this starts a fake LLM server (benchmarks.fake_llm) and one
+uvicorn worker pointed at it, then drives /api/chat/advisor and
+/api/chat/partner from many concurrent users. Run from the backend
+directory:
+
+    python -m benchmarks.chat_load --users 200 --duration 60 --llm-latency-ms 800
+
+Each user holds conversations of --turns messages with a valid JWT and
+think time between turns, then starts a new conversation under a new
+user id. Every --interval seconds the tool prints throughput, latency
+percentiles, errors and the worker's resident memory. A summary follows
+at the end, and --output saves everything as JSON.
+
+To test an already running backend instead, pass --target and, for
+memory readings, --worker-pid. Its rate limits must be raised to allow
+the load.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+from app.dependencies import create_access_token
+from .matching import percentile
+
+MESSAGES = [
+    "Hi! I have a first date on Friday, any advice?",
+    "Where should we go, somewhere quiet or somewhere fun?",
+    "What should I talk about if the conversation stalls?",
+    "How do I know if they are interested in me?",
+    "Should I text them after the date or wait?",
+    "They replied with just one word, what does that mean?",
+    "How soon is too soon to ask for a second date?",
+    "Thanks, that helps a lot!",
+]
+
+def rss_mib(pid: Optional[int]) -> Optional[float]:
+    """Resident memory of a process in MiB, or None if unavailable (non-Linux)."""
+    if pid is None:
+        return None
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+def wait_for_health(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    sys.exit(f"{base_url} did not become ready within {timeout:.0f} s")
+
+@contextmanager
+def local_servers(args: argparse.Namespace) -> Iterator[Tuple[str, int]]:
+    """Start the fake LLM and a backend worker; yield the backend URL and worker pid."""
+    fake_llm = subprocess.Popen([
+        sys.executable, "-m", "benchmarks.fake_llm",
+        "--port", str(args.llm_port),
+        "--latency-ms", str(args.llm_latency_ms),
+        "--jitter-ms", str(args.llm_jitter_ms),
+        "--error-rate", str(args.llm_error_rate),
+    ])
+    env = {
+        **os.environ,
+        "GROQ_API_BASE_URL": f"http://127.0.0.1:{args.llm_port}/v1",
+        # All simulated users share one client address, so lift its limits
+        "RATE_LIMIT_REQUESTS": str(10**9),
+        "RATE_LIMIT_BUDGETS": json.dumps({"llm": 10**9}),
+        "SNAPSHOT_PATH": "",
+    }
+    worker = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port), "--log-level", "warning"],
+        env=env
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        wait_for_health(base_url)
+        yield base_url, worker.pid
+    finally:
+        for process in (worker, fake_llm):
+            process.terminate()
+            process.wait(timeout=10)
+
+class Stats:
+    """Request outcomes, kept in full and per reporting interval."""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.outcomes: Counter = Counter()
+        self.interval_latencies: List[float] = []
+        self.interval_errors = 0
+        self.active_users = 0
+
+    def record(self, latency: float, outcome: str) -> None:
+        self.outcomes[outcome] += 1
+        if outcome == "200":
+            self.latencies.append(latency)
+            self.interval_latencies.append(latency)
+        else:
+            self.interval_errors += 1
+
+    def take_interval(self) -> Tuple[List[float], int]:
+        latencies, errors = self.interval_latencies, self.interval_errors
+        self.interval_latencies, self.interval_errors = [], 0
+        return latencies, errors
+
+async def simulate_user(
+    client: httpx.AsyncClient,
+    index: int,
+    args: argparse.Namespace,
+    stats: Stats,
+    deadline: float
+) -> None:
+    rng = random.Random(index)
+    mode = "advisor" if index % 2 == 0 else "partner"
+    # Spread user start times over the ramp-up period
+    await asyncio.sleep(args.ramp_up * index / args.users)
+    stats.active_users += 1
+    conversation = 0
+    try:
+        while time.monotonic() < deadline:
+            user_id = f"load-{index}-{conversation}"
+            headers = {"Authorization": f"Bearer {create_access_token({'sub': user_id})}"}
+            for turn in range(args.turns):
+                if time.monotonic() >= deadline:
+                    return
+                body = {"message": MESSAGES[turn % len(MESSAGES)], "user_id": user_id, "chat_mode": mode}
+                started = time.perf_counter()
+                try:
+                    response = await client.post(f"/api/chat/{mode}", json=body, headers=headers)
+                    outcome = str(response.status_code)
+                except httpx.HTTPError as e:
+                    outcome = type(e).__name__
+                stats.record(time.perf_counter() - started, outcome)
+                await asyncio.sleep(rng.uniform(0, 2 * args.think_time))
+            conversation += 1
+    finally:
+        stats.active_users -= 1
+
+def latency_summary(latencies: List[float]) -> Dict[str, Optional[float]]:
+    if not latencies:
+        return {"p50_ms": None, "p90_ms": None, "p99_ms": None, "max_ms": None}
+    return {
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+        "p90_ms": round(percentile(latencies, 0.90) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+        "max_ms": round(max(latencies) * 1000, 1),
+    }
+
+async def report(stats: Stats, args: argparse.Namespace, pid: Optional[int], timeline: List[Dict]) -> None:
+    started = time.monotonic()
+    print(f"{'t s':>5} {'users':>6} {'req/s':>7} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7} {'rss MiB':>8}")
+    while True:
+        await asyncio.sleep(args.interval)
+        latencies, errors = stats.take_interval()
+        row = {
+            "t": round(time.monotonic() - started, 1),
+            "users": stats.active_users,
+            "rps": round((len(latencies) + errors) / args.interval, 1),
+            "errors": errors,
+            "rss_mib": rss_mib(pid),
+            **latency_summary(latencies),
+        }
+        timeline.append(row)
+        rss = f"{row['rss_mib']:.1f}" if row["rss_mib"] is not None else "-"
+        print(
+            f"{row['t']:>5.0f} {row['users']:>6} {row['rps']:>7.1f} "
+            f"{row['p50_ms'] or 0:>8.0f} {row['p99_ms'] or 0:>8.0f} {errors:>7} {rss:>8}"
+        )
+
+async def run_load(base_url: str, pid: Optional[int], args: argparse.Namespace) -> Dict:
+    stats = Stats()
+    timeline: List[Dict] = []
+    rss_before = rss_mib(pid)
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as client:
+        reporter = asyncio.create_task(report(stats, args, pid, timeline))
+        started = time.monotonic()
+        deadline = started + args.duration
+        await asyncio.gather(*(simulate_user(client, index, args, stats, deadline) for index in range(args.users)))
+        elapsed = time.monotonic() - started
+        reporter.cancel()
+
+    total = sum(stats.outcomes.values())
+    errors = total - stats.outcomes["200"]
+    rss_after = rss_mib(pid)
+    rss_values = [value for value in [rss_before, *(row["rss_mib"] for row in timeline), rss_after] if value is not None]
+    return {
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+        "summary": {
+            "requests": total,
+            "seconds": round(elapsed, 1),
+            "throughput_rps": round(total / elapsed, 1),
+            "error_rate": round(errors / total, 4) if total else 0.0,
+            "outcomes": dict(stats.outcomes),
+            **latency_summary(stats.latencies),
+            "rss_mib_start": rss_before,
+            "rss_mib_peak": max(rss_values) if rss_values else None,
+            "rss_mib_end": rss_after,
+        },
+        "timeline": timeline,
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds to run")
+    parser.add_argument("--ramp-up", type=float, default=10.0, help="Seconds over which users start")
+    parser.add_argument("--turns", type=int, default=6, help="Messages per conversation")
+    parser.add_argument("--think-time", type=float, default=1.0, help="Mean seconds between turns")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--interval", type=float, default=5.0, help="Seconds between progress lines")
+    parser.add_argument("--output", help="Write the summary and timeline as JSON to this path")
+    parser.add_argument("--target", help="URL of a running backend; skips starting local servers")
+    parser.add_argument("--worker-pid", type=int, help="Backend worker pid for memory readings with --target")
+    parser.add_argument("--port", type=int, default=8765, help="Port for the local backend worker")
+    parser.add_argument("--llm-port", type=int, default=9765, help="Port for the local fake LLM")
+    parser.add_argument("--llm-latency-ms", type=float, default=500.0)
+    parser.add_argument("--llm-jitter-ms", type=float, default=100.0)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    if args.target:
+        wait_for_health(args.target.rstrip("/"))
+        result = asyncio.run(run_load(args.target.rstrip("/"), args.worker_pid, args))
+    else:
+        with local_servers(args) as (base_url, pid):
+            result = asyncio.run(run_load(base_url, pid, args))
+
+    summary = result["summary"]
+    print()
+    print(
+        f"{summary['requests']} requests in {summary['seconds']} s: "
+        f"{summary['throughput_rps']} req/s, error rate {summary['error_rate']:.2%}"
+    )
+    print(
+        f"latency p50 {summary['p50_ms']} ms, p90 {summary['p90_ms']} ms, "
+        f"p99 {summary['p99_ms']} ms, max {summary['max_ms']} ms"
+    )
+    print(f"outcomes {summary['outcomes']}")
+    if summary["rss_mib_start"] is not None:
+        print(
+            f"worker rss {summary['rss_mib_start']:.1f} MiB at start, "
+            f"{summary['rss_mib_peak']:.1f} MiB peak, {summary['rss_mib_end']:.1f} MiB at end"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Wrote {args.output}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
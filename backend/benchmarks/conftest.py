@@ -0,0 +1,156 @@
+"""Performance gate: a pytest plugin for the perf_*.py benchmarks.
+
+Each benchmark times a hot path and checks it against the committed
+baseline in perf_baseline.json. A result fails when it is slower than
+its baseline by more than the entry's tolerance (0.5 means 50% slower).
+Run from the backend directory:
+
+    python -m pytest benchmarks -q
+    python -m pytest benchmarks --perf-update    # re-record the baseline
+
+Baselines are machine specific, so record them on the hardware that
+runs the gate. Re-record after intended performance changes, and keep
+the existing tolerances unless a benchmark proves noisier.
+"""
+import asyncio
+import json
+import os
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+import pytest
+
+# Settings require an API key; the gate never calls the real LLM
+os.environ.setdefault("GROQ_API_KEY", "perf-gate")
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "perf_baseline.json")
+DEFAULT_TOLERANCE = 0.5
+
+def pytest_addoption(parser) -> None:
+    group = parser.getgroup("perf", "performance gate")
+    group.addoption("--perf-baseline", default=BASELINE_PATH, help="Baseline JSON file")
+    group.addoption("--perf-update", action="store_true", help="Record results as the new baseline")
+    group.addoption("--perf-tolerance", type=float, default=None, help="Override every tolerance")
+
+def pytest_collect_file(file_path, parent):
+    # Files named on the command line are already collected by pytest itself
+    if parent.session.isinitpath(file_path):
+        return None
+    if file_path.name.startswith("perf_") and file_path.suffix == ".py":
+        return pytest.Module.from_parent(parent, path=file_path)
+    return None
+
+class PerfGate:
+    """Times benchmarks and compares them with the baseline."""
+
+    def __init__(self, config):
+        self.path = config.getoption("--perf-baseline")
+        self.update = config.getoption("--perf-update")
+        self.tolerance = config.getoption("--perf-tolerance")
+        self.baseline: Dict[str, Dict[str, float]] = {}
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                self.baseline = json.load(f)
+        self.results: Dict[str, float] = {}
+
+    @staticmethod
+    def time(func: Callable[[], object], number: int, repeat: int = 5) -> float:
+        """Best per-call time in seconds over `repeat` runs of `number` calls."""
+        func()
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for _ in range(number):
+                func()
+            best = min(best, (time.perf_counter() - started) / number)
+        return best
+
+    @staticmethod
+    async def time_async(func: Callable[[], Awaitable[object]], number: int, repeat: int = 5) -> float:
+        """Like time, for a coroutine function, within the running event loop."""
+        await func()
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for _ in range(number):
+                await func()
+            best = min(best, (time.perf_counter() - started) / number)
+        return best
+
+    def measure(self, name: str, func: Callable[[], object], number: int, repeat: int = 5) -> float:
+        """Time a function and check it against its budget."""
+        return self.check(name, self.time(func, number, repeat))
+
+    def measure_async(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[object]],
+        number: int,
+        repeat: int = 5
+    ) -> float:
+        """Time a coroutine function in a fresh event loop and check it against its budget."""
+        return self.check(name, asyncio.run(self.time_async(func, number, repeat)))
+
+    def budget(self, name: str) -> Optional[float]:
+        entry = self.baseline.get(name)
+        if entry is None:
+            return None
+        tolerance = self.tolerance if self.tolerance is not None else entry.get("tolerance", DEFAULT_TOLERANCE)
+        return entry["seconds"] * (1 + tolerance)
+
+    def check(self, name: str, seconds: float) -> float:
+        """Record a per-call time and fail the test if it is over budget."""
+        self.results[name] = seconds
+        if self.update:
+            return seconds
+        budget = self.budget(name)
+        if budget is None:
+            pytest.fail(f"{name} has no baseline; record one with --perf-update")
+        if seconds > budget:
+            pytest.fail(
+                f"{name} took {seconds * 1e6:.1f} us per call, over its "
+                f"{budget * 1e6:.1f} us budget (baseline {self.baseline[name]['seconds'] * 1e6:.1f} us)"
+            )
+        return seconds
+
+    def write_baseline(self) -> None:
+        baseline = {}
+        for name, seconds in sorted(self.results.items()):
+            tolerance = self.baseline.get(name, {}).get("tolerance", DEFAULT_TOLERANCE)
+            baseline[name] = {"seconds": float(f"{seconds:.4g}"), "tolerance": tolerance}
+        # Keep entries of benchmarks that were not run this time
+        for name, entry in self.baseline.items():
+            baseline.setdefault(name, entry)
+        with open(self.path, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+perf_gate_key = pytest.StashKey[PerfGate]()
+
+def pytest_configure(config) -> None:
+    config.stash[perf_gate_key] = PerfGate(config)
+
+@pytest.fixture
+def perf(request) -> PerfGate:
+    return request.config.stash[perf_gate_key]
+
+def pytest_sessionfinish(session) -> None:
+    gate = session.config.stash[perf_gate_key]
+    if gate.update and gate.results:
+        gate.write_baseline()
+
+def pytest_terminal_summary(terminalreporter, config) -> None:
+    gate = config.stash[perf_gate_key]
+    if not gate.results:
+        return
+    terminalreporter.section("performance gate")
+    terminalreporter.write_line(f"{'benchmark':<36} {'us/call':>10} {'calls/s':>10} {'baseline':>10} {'change':>8}")
+    for name, seconds in gate.results.items():
+        entry = gate.baseline.get(name)
+        baseline = f"{entry['seconds'] * 1e6:.1f}" if entry else "-"
+        change = f"{(seconds / entry['seconds'] - 1) * 100:+.0f}%" if entry else "-"
+        terminalreporter.write_line(
+            f"{name:<36} {seconds * 1e6:>10.1f} {1 / seconds:>10.0f} {baseline:>10} {change:>8}"
+        )
+    if gate.update:
+        terminalreporter.write_line(f"Baseline written to {gate.path}")
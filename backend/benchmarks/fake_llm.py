@@ -0,0 +1,124 @@
+"""Fake OpenAI-compatible chat completions server for load tests.
+
+Replies after a configurable delay, so backend load tests exercise the
+real HTTP path to the LLM without cost or rate limits. Point the backend
+at it with GROQ_API_BASE_URL:
+
+    python -m benchmarks.fake_llm --port 9000 --latency-ms 800 --jitter-ms 200
+    GROQ_API_BASE_URL=http://127.0.0.1:9000/v1 uvicorn app.main:app
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from typing import Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+REPLY_WORDS = (
+    "That sounds like a great idea for a first date. Try to keep it relaxed, "
+    "ask open questions and let the conversation flow naturally."
+).split()
+
+def create_app(
+    latency_ms: float = 500.0,
+    jitter_ms: float = 100.0,
+    error_rate: float = 0.0,
+    reply_words: int = 60,
+    seed: int = 0
+) -> FastAPI:
+    """Build the fake server.
+
+    Each reply waits latency_ms plus or minus up to jitter_ms, and a
+    fraction error_rate of requests fails with a 500. Requests with
+    "stream": true get the reply as server-sent events, one word per
+    chunk, with a final usage chunk if stream_options.include_usage is set.
+    """
+    app = FastAPI(title="Fake LLM")
+    rng = random.Random(seed)
+    reply = " ".join(REPLY_WORDS[i % len(REPLY_WORDS)] for i in range(reply_words))
+
+    @app.head("/v1/chat/completions")
+    async def preconnect():
+        return None
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        delay = max(0.0, latency_ms + rng.uniform(-jitter_ms, jitter_ms)) / 1000
+        await asyncio.sleep(delay)
+        if rng.random() < error_rate:
+            return JSONResponse({"error": {"message": "Injected failure"}}, status_code=500)
+
+        # Roughly four characters per token, like English text
+        prompt_tokens = sum(len(m.get("content", "")) for m in body.get("messages", [])) // 4
+        completion_tokens = len(reply) // 4
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        if body.get("stream"):
+            include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+            return StreamingResponse(
+                stream_reply(completion_id, created, body.get("model", "fake"), usage if include_usage else None),
+                media_type="text/event-stream"
+            )
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": body.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": reply},
+                "finish_reason": "stop",
+            }],
+            "usage": usage,
+        }
+
+    async def stream_reply(completion_id: str, created: int, model: str, usage: Optional[dict]):
+        def event(choices: list, **extra) -> str:
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": choices,
+                **extra,
+            }
+            return f"data: {json.dumps(chunk)}\n\n"
+
+        words = reply.split(" ")
+        for index, word in enumerate(words):
+            content = word if index == 0 else f" {word}"
+            yield event([{"index": 0, "delta": {"content": content}, "finish_reason": None}])
+        yield event([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+        if usage is not None:
+            yield event([], usage=usage)
+        yield "data: [DONE]\n\n"
+
+    return app
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency-ms", type=float, default=500.0)
+    parser.add_argument("--jitter-ms", type=float, default=100.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--reply-words", type=int, default=60)
+    args = parser.parse_args()
+
+    app = create_app(args.latency_ms, args.jitter_ms, args.error_rate, args.reply_words)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Compare default and fast JSON responses for the chat and matches routes.
+
+Run from the backend directory:
+
+    python -m benchmarks.json_responses --turns 50 --profiles 500
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from app.config import get_settings
+from app.dependencies import create_access_token, rate_limiter
+from app.main import app
+from app.routers import chat_router
+from app.routers.profile_router import profiles
+from .synthetic import generate_profiles
+
+async def fake_groq_response(messages, api_key, usage=None):
+    return "That sounds like a lovely first date idea!"
+
+async def measure(client: httpx.AsyncClient, method: str, url: str, calls: int, **kwargs) -> float:
+    for _ in range(20):
+        await client.request(method, url, **kwargs)
+    started = time.perf_counter()
+    for _ in range(calls):
+        response = await client.request(method, url, **kwargs)
+        response.raise_for_status()
+    return (time.perf_counter() - started) / calls
+
+async def run(args) -> None:
+    settings = get_settings()
+    for limiter in rate_limiter.limiters.values():
+        limiter.limit = 10**9
+    chat_router.get_groq_response = fake_groq_response
+
+    user_id = "user-0"
+    for index, profile in enumerate(generate_profiles(args.profiles)):
+        profiles[f"user-{index}"] = profile
+    chat_state = chat_router.get_chat_state(user_id)
+    for turn in range(args.turns):
+        chat_state.add_message("user", f"Question {turn} about my date")
+        chat_state.add_message("assistant", f"Answer {turn} with some advice")
+
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user_id})}"}
+    chat_body = {"message": "Hi", "user_id": user_id, "chat_mode": "advisor"}
+    # Keep the chat history a fixed length between calls
+    history = list(chat_state.messages)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        print(f"{'route':<10} {'mode':<8} {'ms/request':>10}")
+        for route in ("chat", "matches"):
+            for fast in (False, True):
+                settings.FAST_JSON_RESPONSES = fast
+                if route == "chat":
+                    chat_state.messages = history
+                    seconds = await measure(client, "POST", "/api/chat/advisor", args.calls, json=chat_body)
+                else:
+                    seconds = await measure(
+                        client, "GET", f"/api/matches/{user_id}", args.calls,
+                        params={"min_score": 0, "limit": args.profiles}
+                    )
+                print(f"{route:<10} {'fast' if fast else 'default':<8} {seconds * 1000:>10.2f}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--profiles", type=int, default=500)
+    parser.add_argument("--calls", type=int, default=200)
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
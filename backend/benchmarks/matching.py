@@ -0,0 +1,199 @@
+"""Benchmark match scoring and the get_matches route at several store sizes.
+
+Run from the backend directory:
+
+    python -m benchmarks.matching --sizes 1000 10000 100000 1000000 --output matching.json
+    python -m benchmarks.matching --sizes 1000 10000 --compare matching.json
+    python -m benchmarks.matching --sizes 100000 --free-text 0.5
+
+For each size, a ProfileStore is filled with synthetic profiles. The
+benchmark then reports:
+
+- p50/p99 latency of calculate_match_score over random pairs
+- p50/p99 latency and peak allocation of get_matches for random users
+- memory retained by the store
+
+--output writes the results as JSON, tagged with the git commit.
+--compare prints the change against such a file from an earlier run.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+from fastapi import Request, Response
+
+from app.models.profile_store import ProfileStore
+from app.routers import matches_router
+from .profile_memory import deep_sizeof
+from .synthetic import generate_profiles
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of unsorted samples."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def summarize(samples: List[float], scale: float) -> Dict[str, float]:
+    return {
+        "samples": len(samples),
+        "p50": round(percentile(samples, 0.50) * scale, 3),
+        "p99": round(percentile(samples, 0.99) * scale, 3),
+        "mean": round(statistics.fmean(samples) * scale, 3),
+    }
+
+def build_store(size: int, seed: int, free_text: float = 0.0) -> ProfileStore:
+    store = ProfileStore()
+    for index, profile in enumerate(generate_profiles(size, seed, free_text)):
+        store[f"user-{index}"] = profile
+    return store
+
+def bench_score(store: ProfileStore, rng: random.Random, pairs: int) -> Dict[str, float]:
+    """Time calculate_match_score on random pairs, in microseconds."""
+    user_ids = list(store)
+    score = matches_router.calculate_match_score
+    samples = []
+    for _ in range(pairs):
+        user, candidate = store[rng.choice(user_ids)], store[rng.choice(user_ids)]
+        started = time.perf_counter()
+        score(user, candidate)
+        samples.append(time.perf_counter() - started)
+    return summarize(samples, 1e6)
+
+async def _get_matches(user_id: str):
+    request = Request({"type": "http", "method": "GET", "path": f"/api/matches/{user_id}", "headers": []})
+    return await matches_router.get_matches(
+        user_id,
+        request,
+        Response(),
+        min_score=50.0,
+        limit=10,
+        commons={"user_id": user_id}
+    )
+
+async def bench_get_matches(user_ids: List[str], memory_queries: int) -> Dict[str, float]:
+    """Time get_matches for each user, in milliseconds, then measure peak allocation."""
+    samples = []
+    for user_id in user_ids:
+        started = time.perf_counter()
+        await _get_matches(user_id)
+        samples.append(time.perf_counter() - started)
+    result = summarize(samples, 1e3)
+
+    # Allocation is measured separately, since tracing slows every call
+    peaks = []
+    tracemalloc.start()
+    for user_id in user_ids[:memory_queries]:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        await _get_matches(user_id)
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+    result["peak_alloc_bytes"] = max(peaks) if peaks else 0
+    return result
+
+def run_size(size: int, args: argparse.Namespace) -> Dict:
+    rng = random.Random(args.seed)
+
+    started = time.perf_counter()
+    store = build_store(size, args.seed, args.free_text)
+    build_seconds = time.perf_counter() - started
+
+    # The route reads the module-level store
+    matches_router.profiles = store
+    queries = args.queries or max(5, min(200, 2_000_000 // size))
+    user_ids = rng.choices(list(store), k=queries)
+
+    return {
+        "profiles": size,
+        "build_seconds": round(build_seconds, 2),
+        "store_bytes": deep_sizeof(store),
+        "score_us": bench_score(store, rng, args.pairs),
+        "get_matches_ms": asyncio.run(bench_get_matches(user_ids, min(queries, 5))),
+    }
+
+def git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True)
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+def print_result(result: Dict, previous: Optional[Dict]) -> None:
+    def change(section: str, key: str) -> str:
+        if not previous:
+            return ""
+        before = previous[section][key]
+        return f" ({(result[section][key] / before - 1) * 100:+.0f}%)" if before else ""
+
+    score, route = result["score_us"], result["get_matches_ms"]
+    print(
+        f"{result['profiles']:>9} profiles  "
+        f"store {result['store_bytes'] / 2**20:.1f} MiB, built in {result['build_seconds']:.1f} s"
+    )
+    print(
+        f"{'':>20}score p50 {score['p50']:.2f} us{change('score_us', 'p50')}, "
+        f"p99 {score['p99']:.2f} us{change('score_us', 'p99')}"
+    )
+    print(
+        f"{'':>20}get_matches p50 {route['p50']:.2f} ms{change('get_matches_ms', 'p50')}, "
+        f"p99 {route['p99']:.2f} ms{change('get_matches_ms', 'p99')}, "
+        f"peak alloc {route['peak_alloc_bytes'] / 2**20:.1f} MiB over {route['samples']} queries"
+    )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--free-text",
+        type=float,
+        default=0.0,
+        help="Fraction of profiles with unique free-text fields",
+    )
+    parser.add_argument("--pairs", type=int, default=20_000, help="Random pairs for calculate_match_score")
+    parser.add_argument(
+        "--queries",
+        type=int,
+        default=None,
+        help="get_matches calls per size (default: fewer for larger stores)",
+    )
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    args = parser.parse_args()
+
+    previous = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        previous = {result["profiles"]: result for result in baseline["results"]}
+        print(f"Comparing against {baseline.get('commit') or args.compare}")
+
+    results = []
+    for size in args.sizes:
+        result = run_size(size, args)
+        results.append(result)
+        print_result(result, previous.get(size))
+
+    if args.output:
+        report = {
+            "benchmark": "matching",
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "free_text": args.free_text,
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.output}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
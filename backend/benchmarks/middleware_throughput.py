@@ -0,0 +1,80 @@
+"""Compare request throughput of the old and new rate limiting stacks.
+
+The old stack is a BaseHTTPMiddleware plus a second limiter call in the
+route dependency. The new stack is the pure ASGI RateLimitMiddleware.
+
+Run from the backend directory:
+
+    python -m benchmarks.middleware_throughput --requests 5000
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import Depends, FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.middleware.rate_limit import RateLimitMiddleware
+from app.rate_limiter import CostRateLimiter, SlidingWindowLimiter
+
+LIMIT = 10**9
+
+def build_old_app() -> FastAPI:
+    limiter = SlidingWindowLimiter(LIMIT, 3600)
+
+    async def check(request: Request):
+        limiter.hit(request.client.host)
+
+    class OldRateLimitMiddleware(BaseHTTPMiddleware):
+        async def dispatch(self, request, call_next):
+            await check(request)
+            return await call_next(request)
+
+    app = FastAPI()
+    app.add_middleware(OldRateLimitMiddleware)
+
+    @app.get("/api/ping")
+    async def ping(_: None = Depends(check)):
+        return {"ok": True}
+
+    return app
+
+def build_new_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(
+        RateLimitMiddleware, limiter=CostRateLimiter({"default": LIMIT}, 3600, {})
+    )
+
+    @app.get("/api/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+async def measure(app: FastAPI, requests: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker(count: int):
+            for _ in range(count):
+                await client.get("/api/ping")
+
+        await worker(100)  # warm up
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(requests // concurrency) for _ in range(concurrency)))
+        return (requests // concurrency * concurrency) / (time.perf_counter() - started)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    old = asyncio.run(measure(build_old_app(), args.requests, args.concurrency))
+    new = asyncio.run(measure(build_new_app(), args.requests, args.concurrency))
+    print(f"{'stack':<28} {'req/s':>8}")
+    print(f"{'BaseHTTPMiddleware + dep':<28} {old:>8.0f}")
+    print(f"{'pure ASGI middleware':<28} {new:>8.0f} ({(new / old - 1) * 100:+.0f}%)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""Performance budgets for authentication and rate limiting."""
+import pytest
+from fastapi import Request
+
+from app import dependencies
+from app.dependencies import check_rate_limit, create_access_token, get_current_user
+
+@pytest.fixture
+def token() -> str:
+    return create_access_token({"sub": "perf-user"})
+
+def test_get_current_user_cached(perf, token):
+    dependencies.token_cache.clear()
+    perf.measure_async("get_current_user_cached", lambda: get_current_user(token), number=20_000)
+
+def test_get_current_user_uncached(perf, token, monkeypatch):
+    monkeypatch.setattr(dependencies.token_cache, "max_size", 0)
+    dependencies.token_cache.clear()
+    perf.measure_async("get_current_user_uncached", lambda: get_current_user(token), number=2_000)
+
+def test_check_rate_limit(perf, monkeypatch):
+    for limiter in dependencies.rate_limiter.limiters.values():
+        monkeypatch.setattr(limiter, "limit", 10**12)
+    request = Request({
+        "type": "http",
+        "method": "POST",
+        "path": "/api/chat/advisor",
+        "headers": [],
+        "client": ("10.0.0.1", 1234),
+    })
+    perf.measure_async("check_rate_limit", lambda: check_rate_limit(request), number=20_000)
@@ -0,0 +1,50 @@
+"""Performance budget for a chat round trip against the fake LLM.
+
+The request goes through the full middleware stack, auth and the chat
+router, and the LLM call goes over httpx to benchmarks.fake_llm with no
+added latency, so only backend overhead is measured.
+"""
+import asyncio
+
+import httpx
+
+from app import dependencies
+from app.dependencies import create_access_token
+from app.main import app
+from app.routers import chat_router
+from benchmarks.fake_llm import create_app
+
+HISTORY_TURNS = 10
+
+def test_chat_round_trip(perf, monkeypatch):
+    for limiter in dependencies.rate_limiter.limiters.values():
+        monkeypatch.setattr(limiter, "limit", 10**12)
+    monkeypatch.setattr(chat_router, "GROQ_API_URL", "http://fake-llm/v1/chat/completions")
+
+    user_id = "perf-chat-user"
+    chat_state = chat_router.get_chat_state(user_id)
+    for turn in range(HISTORY_TURNS):
+        chat_state.add_message("user", f"Question {turn} about my date")
+        chat_state.add_message("assistant", f"Answer {turn} with some advice")
+    # Reset to the same history before each call, so every turn costs the same
+    history = list(chat_state.messages)
+
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user_id})}"}
+    body = {"message": "Where should we go?", "user_id": user_id, "chat_mode": "advisor"}
+
+    async def run() -> float:
+        fake_llm = httpx.AsyncClient(transport=httpx.ASGITransport(app=create_app(latency_ms=0, jitter_ms=0)))
+        monkeypatch.setattr(chat_router, "_http_client", fake_llm)
+        transport = httpx.ASGITransport(app=app)
+        async with fake_llm, httpx.AsyncClient(transport=transport, base_url="http://perf", headers=headers) as client:
+            async def round_trip():
+                chat_state.messages = list(history)
+                response = await client.post("/api/chat/advisor", json=body)
+                response.raise_for_status()
+
+            return await perf.time_async(round_trip, number=200)
+
+    try:
+        perf.check("chat_round_trip", asyncio.run(run()))
+    finally:
+        chat_router.chat_states.pop(user_id, None)
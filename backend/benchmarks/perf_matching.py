@@ -0,0 +1,59 @@
+"""Performance budgets for profile matching."""
+import itertools
+import random
+
+import pytest
+from fastapi import Request, Response
+
+from app.models.profile_store import ProfileStore
+from app.routers import matches_router
+from benchmarks.synthetic import generate_profiles
+
+STORE_SIZE = 10_000
+
+@pytest.fixture(scope="module")
+def store() -> ProfileStore:
+    store = ProfileStore()
+    for index, profile in enumerate(generate_profiles(STORE_SIZE)):
+        store[f"user-{index}"] = profile
+    return store
+
+@pytest.fixture(scope="module")
+def free_text_store() -> ProfileStore:
+    # Half the profiles with unique occupations, hobbies, goals and deal-breakers
+    store = ProfileStore()
+    for index, profile in enumerate(generate_profiles(STORE_SIZE, free_text=0.5)):
+        store[f"user-{index}"] = profile
+    return store
+
+def test_calculate_match_score(perf, store):
+    rng = random.Random(0)
+    user_ids = list(store)
+    pairs = [(store[rng.choice(user_ids)], store[rng.choice(user_ids)]) for _ in range(1000)]
+    next_pair = itertools.cycle(pairs).__next__
+    score = matches_router.calculate_match_score
+    perf.measure("calculate_match_score", lambda: score(*next_pair()), number=20_000)
+
+@pytest.mark.parametrize("store_fixture, name, filters, number", [
+    ("store", f"get_matches_{STORE_SIZE}", {}, 5),
+    (
+        "store",
+        f"get_matches_{STORE_SIZE}_age_location",
+        {"min_age": 25, "max_age": 35, "location": "London"},
+        50,
+    ),
+    ("free_text_store", f"get_matches_{STORE_SIZE}_free_text", {}, 5),
+])
+def test_get_matches(perf, request, monkeypatch, store_fixture, name, filters, number):
+    store = request.getfixturevalue(store_fixture)
+    monkeypatch.setattr(matches_router, "profiles", store)
+    user_ids = itertools.cycle(random.Random(0).sample(list(store), 20))
+
+    async def get_matches():
+        user_id = next(user_ids)
+        http_request = Request({"type": "http", "method": "GET", "path": f"/api/matches/{user_id}", "headers": []})
+        await matches_router.get_matches(
+            user_id, http_request, Response(), min_score=50.0, limit=10, commons={"user_id": user_id}, **filters
+        )
+
+    perf.measure_async(name, get_matches, number=number, repeat=3)
@@ -0,0 +1,12 @@
+"""Performance budget for backend start-up."""
+import statistics
+
+from benchmarks.startup_time import MODULE, import_times
+
+RUNS = 5
+
+def test_import_time(perf):
+    # Warm-up run so bytecode compilation is not measured
+    import_times(MODULE)
+    median_ms = statistics.median(import_times(MODULE)[0] for _ in range(RUNS))
+    perf.check("import_app_main", median_ms / 1000)
@@ -0,0 +1,80 @@
+"""Compare memory retained by plain UserProfile storage and the ProfileStore.
+
+Run from the backend directory:
+
+    python -m benchmarks.profile_memory --sizes 100000 1000000
+    python -m benchmarks.profile_memory --sizes 50000 --free-text 1.0
+"""
+import argparse
+import sys
+import time
+from types import ModuleType
+
+from app.models.profile_store import ProfileStore
+from .synthetic import generate_profiles
+
+def deep_sizeof(root) -> int:
+    """Sum the sizes of every object reachable from root, counting each once."""
+    seen = set()
+    stack = [root]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, (type, ModuleType)):
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        if hasattr(obj, "__dict__"):
+            stack.append(obj.__dict__)
+        for cls in type(obj).__mro__:
+            for slot in getattr(cls, "__slots__", ()):
+                if slot not in ("__dict__", "__weakref__") and hasattr(obj, slot):
+                    stack.append(getattr(obj, slot))
+    return total
+
+def measure(size: int, compact: bool, free_text: float = 0.0) -> dict:
+    """Store `size` synthetic profiles and return retained bytes."""
+    started = time.perf_counter()
+    store = ProfileStore() if compact else {}
+    for index, profile in enumerate(generate_profiles(size, free_text=free_text)):
+        store[f"user-{index}"] = profile
+    elapsed = time.perf_counter() - started
+    return {"bytes": deep_sizeof(store), "seconds": elapsed}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument(
+        "--skip-plain-above",
+        type=int,
+        default=None,
+        help="Skip the plain dict measurement above this size to bound memory",
+    )
+    parser.add_argument(
+        "--free-text",
+        type=float,
+        default=0.0,
+        help="Fraction of profiles with unique free-text fields",
+    )
+    args = parser.parse_args()
+
+    print(f"{'profiles':>10} {'store':>8} {'MiB':>10} {'bytes/profile':>14} {'build s':>8}")
+    for size in args.sizes:
+        for compact in (False, True):
+            if not compact and args.skip_plain_above and size > args.skip_plain_above:
+                continue
+            result = measure(size, compact, args.free_text)
+            print(
+                f"{size:>10} {'compact' if compact else 'plain':>8} "
+                f"{result['bytes'] / 2**20:>10.1f} {result['bytes'] / size:>14.0f} "
+                f"{result['seconds']:>8.1f}"
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Compare the sliding-window-counter limiter with the old list-based one.
+
+Run from the backend directory:
+
+    python -m benchmarks.rate_limit --keys 1000 --calls 200000
+"""
+import argparse
+import random
+import time
+from typing import Dict
+
+from app.rate_limiter import SlidingWindowLimiter
+
+LIMIT = 100
+PERIOD = 3600
+
+class ListLimiter:
+    """The previous implementation: a timestamp list per key."""
+
+    def __init__(self, limit: int, period: float):
+        self.limit = limit
+        self.period = period
+        self.store: Dict[str, Dict] = {}
+
+    def hit(self, key: str, now: float) -> bool:
+        if key in self.store:
+            self.store[key]["requests"] = [
+                req_time for req_time in self.store[key]["requests"]
+                if now - req_time < self.period
+            ]
+            if len(self.store[key]["requests"]) >= self.limit:
+                return False
+            self.store[key]["requests"].append(now)
+        else:
+            self.store[key] = {"requests": [now]}
+        return True
+
+def run(limiter, keys, now_values) -> float:
+    hit = limiter.hit
+    started = time.perf_counter()
+    for key, now in zip(keys, now_values):
+        hit(key, now=now)
+    return time.perf_counter() - started
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--keys", type=int, default=1000)
+    parser.add_argument("--calls", type=int, default=200_000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    keys = [f"10.0.{i // 256}.{i % 256}" for i in range(args.keys)]
+    sequence = [rng.choice(keys) for _ in range(args.calls)]
+    # Spread calls over two periods so windows roll and keys go idle
+    now_values = [i * (2 * PERIOD / args.calls) for i in range(args.calls)]
+
+    old = ListLimiter(LIMIT, PERIOD)
+    new = SlidingWindowLimiter(LIMIT, PERIOD)
+    old_seconds = run(old, sequence, now_values)
+    new_seconds = run(new, sequence, now_values)
+
+    old_slots = sum(len(entry["requests"]) for entry in old.store.values())
+    print(f"{'limiter':<16} {'ns/call':>10} {'keys':>8} {'stored values':>14}")
+    print(f"{'list (old)':<16} {old_seconds / args.calls * 1e9:>10.0f} {len(old.store):>8} {old_slots:>14}")
+    print(f"{'sliding window':<16} {new_seconds / args.calls * 1e9:>10.0f} {len(new):>8} {len(new) * 3:>14}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Time snapshot capture, write and restore of backend state.
+
+Run from the backend directory:
+
+    python -m benchmarks.snapshot_timing --profiles 100000 --chats 10000
+"""
+import argparse
+import asyncio
+import gc
+import os
+import tempfile
+import time
+
+from app.models.chat import ChatState
+from app.models.profile_store import ProfileStore
+from app import snapshot
+from .synthetic import generate_profiles
+
+async def timed_capture(profiles: ProfileStore, chat_states: dict):
+    """Capture state; return it with the longest time the event loop was blocked."""
+    longest = 0.0
+    done = False
+
+    async def watch() -> None:
+        nonlocal longest
+        last = time.perf_counter()
+        while not done:
+            await asyncio.sleep(0)
+            now = time.perf_counter()
+            longest = max(longest, now - last)
+            last = now
+
+    watcher = asyncio.create_task(watch())
+    await asyncio.sleep(0)
+    state = await snapshot.capture_state(profiles, chat_states)
+    done = True
+    await watcher
+    return state, longest
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--profiles", type=int, default=100_000)
+    parser.add_argument("--chats", type=int, default=10_000)
+    parser.add_argument("--turns", type=int, default=10, help="Chat turns per user")
+    args = parser.parse_args()
+
+    profiles = ProfileStore()
+    for index, profile in enumerate(generate_profiles(args.profiles)):
+        profiles[f"user-{index}"] = profile
+    chat_states = {}
+    for index in range(args.chats):
+        state = ChatState(user_id=f"user-{index}")
+        for turn in range(args.turns):
+            state.add_message("user", f"Question {turn} about my date on Friday")
+            state.add_message("assistant", f"Answer {turn} with some dating advice")
+        chat_states[state.user_id] = state
+
+    path = os.path.join(tempfile.mkdtemp(), "state.snap")
+    # Settle the garbage collector after building the state, so its
+    # pending full collection is not counted as capture time
+    gc.collect()
+
+    started = time.perf_counter()
+    state, longest_block = asyncio.run(timed_capture(profiles, chat_states))
+    captured = time.perf_counter()
+    size = snapshot.write_snapshot(path, state)
+    written = time.perf_counter()
+
+    restored_profiles = ProfileStore()
+    restored_chats = {}
+    snapshot.restore(path, restored_profiles, restored_chats)
+    restored = time.perf_counter()
+    assert len(restored_profiles) == len(profiles)
+    assert len(restored_chats) == len(chat_states)
+
+    print(f"profiles={args.profiles} chats={args.chats} size={size / 2**20:.1f} MiB")
+    print(f"capture (event loop): {(captured - started) * 1000:8.1f} ms, longest block {longest_block * 1000:.1f} ms")
+    print(f"write (thread):       {(written - captured) * 1000:8.1f} ms")
+    print(f"restore:              {(restored - written) * 1000:8.1f} ms")
+    os.remove(path)
+
+if __name__ == "__main__":
+    main()
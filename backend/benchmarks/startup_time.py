@@ -0,0 +1,84 @@
+"""Report the import-time breakdown of app.main and enforce a budget.
+
+Each run imports app.main in a fresh interpreter with -X importtime.
+Self time is summed per top-level package, and the median total is
+checked against --budget-ms, so this can gate CI:
+
+    python -m benchmarks.startup_time --runs 5 --budget-ms 600
+
+Exits with status 1 if the median import time is over budget. The
+performance gate runs the same measurement as perf_startup.py.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, Tuple
+
+MODULE = "app.main"
+
+def import_times(module: str) -> Tuple[float, Dict[str, float]]:
+    """Import module in a fresh interpreter and return its total and per-module self times in ms."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": os.getcwd()},
+    )
+    if result.returncode != 0:
+        sys.exit(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    total = 0.0
+    modules: Dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        modules[name] = int(self_us) / 1000
+        if name == module:
+            total = int(cumulative_us) / 1000
+    return total, modules
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    # Warm-up run so bytecode compilation is not measured
+    import_times(MODULE)
+
+    totals = []
+    packages: Dict[str, float] = defaultdict(float)
+    app_modules: Dict[str, float] = defaultdict(float)
+    for _ in range(args.runs):
+        total, modules = import_times(MODULE)
+        totals.append(total)
+        for name, self_ms in modules.items():
+            packages[name.split(".")[0]] += self_ms / args.runs
+            if name.startswith("app."):
+                app_modules[name] += self_ms / args.runs
+
+    print(f"{'package':<32} {'self ms':>8}")
+    for name, ms in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{name:<32} {ms:>8.1f}")
+    print()
+    print(f"{'app module':<32} {'self ms':>8}")
+    for name, ms in sorted(app_modules.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{name:<32} {ms:>8.1f}")
+
+    median = statistics.median(totals)
+    print()
+    print(f"import {MODULE}: median {median:.1f} ms, min {min(totals):.1f} ms over {args.runs} runs")
+    if args.budget_ms is not None:
+        if median > args.budget_ms:
+            print(f"FAIL: over the {args.budget_ms:.0f} ms budget")
+            sys.exit(1)
+        print(f"OK: within the {args.budget_ms:.0f} ms budget")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Seeded synthetic profile generator for benchmarks.
+
+Vocabulary lists are ordered from most to least common, and picks follow
+a Zipf-like distribution over that order, so a few hobbies, values and
+languages are shared by many profiles while the tail is rare. Gender
+preferences follow GENDER_PREFERENCES rather than being uniform.
+
+The UI takes occupation, hobbies, life goals and deal-breakers as free
+text. With free_text > 0, that fraction of profiles also gets values of
+its own in those fields, for the high-cardinality case.
+"""
+import random
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from app.models.schemas import UserProfile
+
+GENDERS = ["Male", "Female", "Non-binary", "Other"]
+GENDER_WEIGHTS = [48, 48, 3, 1]
+# Gender -> (interested_in options, weights)
+GENDER_PREFERENCES: Dict[str, Tuple[List[List[str]], List[int]]] = {
+    "Male": ([["Female"], ["Male"], ["Female", "Male"], ["Female", "Non-binary"]], [85, 8, 5, 2]),
+    "Female": ([["Male"], ["Female"], ["Male", "Female"], ["Male", "Non-binary"]], [83, 7, 8, 2]),
+    "Non-binary": ([["Non-binary"], ["Male", "Female"], ["Female", "Non-binary"], ["Male", "Non-binary"]], [30, 30, 20, 20]),
+    "Other": ([["Male"], ["Female"], ["Male", "Female", "Non-binary", "Other"]], [30, 30, 40]),
+}
+RELATIONSHIP_GOALS = ["Long-term relationship", "Casual dating", "Friendship", "Marriage"]
+HOBBIES = [
+    "Hiking", "Reading", "Cooking", "Travel", "Photography", "Gaming", "Yoga",
+    "Running", "Painting", "Music", "Dancing", "Cycling", "Gardening", "Movies",
+    "Board games", "Climbing", "Swimming", "Writing", "Volunteering", "Baking",
+]
+PERSONALITY_TRAITS = [
+    "Outgoing", "Reserved", "Creative", "Analytical", "Adventurous",
+    "Easy-going", "Ambitious", "Empathetic",
+]
+PARTNER_TRAITS = [
+    "Honest", "Caring", "Ambitious", "Funny", "Intelligent", "Independent",
+    "Family-oriented", "Adventurous",
+]
+# Some deal-breakers name other fields' values, so the match filter has work
+DEAL_BREAKERS = [
+    "Smoking", "Dishonesty", "Casual dating", "Rudeness", "Gaming", "Laziness",
+    "Jealousy", "Outgoing", "Arrogance",
+]
+LOVE_LANGUAGES = [
+    "Words of Affirmation", "Quality Time", "Physical Touch", "Acts of Service",
+    "Receiving Gifts",
+]
+COMMUNICATION_STYLES = ["Direct", "Indirect", "Emotional", "Analytical", "Mixed"]
+LIFE_GOALS = ["Travel the world", "Start a family", "Own a home", "Start a business", "Retire early"]
+VALUES = [
+    "Family", "Career", "Personal Growth", "Adventure", "Creativity", "Health",
+    "Education", "Spirituality",
+]
+LOCATIONS = ["New York", "London", "Berlin", "Toronto", "Sydney", "Paris", "Tokyo", "Austin"]
+LANGUAGES = ["English", "Spanish", "French", "German", "Chinese", "Japanese"]
+LANGUAGE_WEIGHTS = [70, 12, 6, 5, 4, 3]
+EDUCATION = ["High School", "Some College", "Bachelor's", "Master's", "PhD"]
+OCCUPATIONS = ["Engineer", "Teacher", "Nurse", "Designer", "Lawyer", "Chef", "Artist", "Student"]
+
+def _copy(value: str) -> str:
+    # Decoded request bodies give every profile its own string objects
+    return value.encode().decode()
+
+def zipf_weights(size: int, exponent: float = 1.0) -> List[float]:
+    """Weights proportional to 1 / rank**exponent."""
+    return [1 / rank ** exponent for rank in range(1, size + 1)]
+
+def _weighted_sample(rng: random.Random, vocab: Sequence[str], weights: Sequence[float], count: int) -> List[str]:
+    # Weighted sampling without replacement (Efraimidis-Spirakis keys)
+    keys = sorted(((rng.random() ** (1 / weight), value) for value, weight in zip(vocab, weights)), reverse=True)
+    return [value for _, value in keys[:count]]
+
+def _pick(rng: random.Random, vocab, low: int, high: int, weights: Sequence[float] = None):
+    weights = weights or _ZIPF[len(vocab)]
+    return [_copy(value) for value in _weighted_sample(rng, vocab, weights, rng.randint(low, high))]
+
+def _choice(rng: random.Random, vocab, weights: Sequence[float] = None) -> str:
+    return _copy(rng.choices(vocab, weights or _ZIPF[len(vocab)])[0])
+
+_ZIPF = {size: zipf_weights(size) for size in range(1, 32)}
+
+def generate_profile(rng: random.Random, index: int, free_text: float = 0.0) -> UserProfile:
+    """Generate a single synthetic profile."""
+    gender = rng.choices(GENDERS, GENDER_WEIGHTS)[0]
+    preferences, preference_weights = GENDER_PREFERENCES[gender]
+    profile = UserProfile(
+        name=f"User {index}",
+        # Skewed towards the late twenties, like most dating app users
+        age=round(rng.triangular(18, 70, 28)),
+        gender=_copy(gender),
+        interested_in=[_copy(value) for value in rng.choices(preferences, preference_weights)[0]],
+        relationship_goals=_choice(rng, RELATIONSHIP_GOALS),
+        hobbies=_pick(rng, HOBBIES, 2, 6),
+        personality_traits=_pick(rng, PERSONALITY_TRAITS, 1, 3),
+        ideal_partner_traits=_pick(rng, PARTNER_TRAITS, 1, 3),
+        deal_breakers=_pick(rng, DEAL_BREAKERS, 0, 2),
+        love_language=_choice(rng, LOVE_LANGUAGES),
+        communication_style=_choice(rng, COMMUNICATION_STYLES),
+        life_goals=_pick(rng, LIFE_GOALS, 1, 2),
+        values=_pick(rng, VALUES, 1, 4),
+        location=_choice(rng, LOCATIONS),
+        languages=_pick(rng, LANGUAGES, 1, 2, LANGUAGE_WEIGHTS),
+        education=_choice(rng, EDUCATION, [25, 15, 35, 20, 5]),
+        occupation=_choice(rng, OCCUPATIONS),
+    )
+    if free_text and rng.random() < free_text:
+        profile.occupation = f"{profile.occupation} of {rng.getrandbits(48):x}"
+        profile.hobbies.append(f"Collecting {rng.getrandbits(48):x}")
+        profile.life_goals.append(f"Visit {rng.getrandbits(48):x}")
+        profile.deal_breakers.append(f"Dislikes {rng.getrandbits(48):x}")
+    return profile
+
+def generate_profiles(count: int, seed: int = 42, free_text: float = 0.0) -> Iterator[UserProfile]:
+    """Generate a reproducible stream of synthetic profiles."""
+    rng = random.Random(seed)
+    for index in range(count):
+        yield generate_profile(rng, index, free_text)
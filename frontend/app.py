@@ -1,6 +1,6 @@
 import streamlit as st
-import asyncio
-from utils.api_client import APIClient, APIError
+import httpx
+from utils.api_client import APIClient, APIError, create_http_client
 from utils.helpers import (
     init_session_state,
     display_chat_history,
@@ -18,8 +18,15 @@ st.set_page_config(
     layout="wide"
 )
 
-# Initialize API client
-api_client = APIClient()
+@st.cache_resource
+def get_http_client() -> httpx.Client:
+    """Keep-alive connection pool shared by all sessions."""
+    return create_http_client()
+
+# Initialize API client once per session so its ETag cache survives reruns
+if "api_client" not in st.session_state:
+    st.session_state.api_client = APIClient(http_client=get_http_client())
+api_client = st.session_state.api_client
 
 # Initialize session state
 init_session_state()
@@ -39,9 +46,7 @@ def main():
         
         try:
             # Get current profile if it exists
-            current_profile = asyncio.run(
-                api_client.get_profile(st.session_state.user_id)
-            )
+            current_profile = api_client.get_profile(st.session_state.user_id)
         except APIError:
             current_profile = None
         
@@ -51,9 +56,7 @@ def main():
         if profile_data:
             with display_loading("Saving profile..."):
                 try:
-                    asyncio.run(
-                        api_client.update_profile(st.session_state.user_id, profile_data)
-                    )
+                    api_client.update_profile(st.session_state.user_id, profile_data)
                     st.session_state.profile_complete = True
                     st.success("Profile saved successfully!")
                 except APIError as e:
@@ -73,9 +76,7 @@ def main():
         if message:
             with display_loading("Getting advice..."):
                 try:
-                    response = asyncio.run(
-                        api_client.chat_with_advisor(message, st.session_state.user_id)
-                    )
+                    response = api_client.chat_with_advisor(message, st.session_state.user_id)
                     st.session_state.chat_history = response["chat_history"]
                     st.experimental_rerun()
                 except APIError as e:
@@ -95,9 +96,7 @@ def main():
         if message:
             with display_loading("Getting response..."):
                 try:
-                    response = asyncio.run(
-                        api_client.chat_with_partner(message, st.session_state.user_id)
-                    )
+                    response = api_client.chat_with_partner(message, st.session_state.user_id)
                     st.session_state.chat_history = response["chat_history"]
                     st.experimental_rerun()
                 except APIError as e:
@@ -112,16 +111,20 @@ def main():
         
         min_score = st.slider("Minimum Match Score", 0, 100, 50)
         limit = st.number_input("Number of Matches", min_value=1, max_value=50, value=10)
+        min_age, max_age = st.slider("Age Range", 18, 99, (18, 99))
+        location = st.text_input("Location (leave empty for anywhere)").strip()
         
         if st.button("Find Matches"):
             with display_loading("Finding matches..."):
                 try:
-                    matches = asyncio.run(
-                        api_client.get_matches(
-                            st.session_state.user_id,
-                            min_score=min_score,
-                            limit=limit
-                        )
+                    matches = api_client.get_matches(
+                        st.session_state.user_id,
+                        min_score=min_score,
+                        limit=limit,
+                        # Only send bounds that narrow the search
+                        min_age=min_age if min_age > 18 else None,
+                        max_age=max_age if max_age < 99 else None,
+                        location=location or None
                     )
                     if matches:
                         display_matches(matches)
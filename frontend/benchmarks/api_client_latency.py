@@ -0,0 +1,85 @@
+"""Compare per-interaction latency of the old and new API client paths.
+
+The old path ran every call through asyncio.run with a fresh
+httpx.AsyncClient, so each interaction built an event loop and opened a
+new connection. The new path reuses one pooled keep-alive httpx.Client.
+
+A local HTTP/1.1 server stands in for the backend, so only client-side
+overhead is measured; against a remote backend over TLS the saved
+connection setup is much larger.
+
+Run from the frontend directory:
+
+    python -m benchmarks.api_client_latency --calls 500
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List
+
+import httpx
+
+from utils.api_client import APIClient
+
+BODY = json.dumps({"name": "Bench", "age": 30, "hobbies": ["hiking", "reading"]}).encode()
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; avoid Nagle/delayed-ACK stalls
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args) -> None:
+        pass
+
+async def legacy_get(url: str) -> dict:
+    # What APIClient._make_request used to do for every call
+    async with httpx.AsyncClient() as client:
+        response = await client.request("GET", url, timeout=30.0)
+        response.raise_for_status()
+        return response.json()
+
+def measure(call: Callable[[], object], calls: int) -> List[float]:
+    call()
+    samples = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=500)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    old = measure(lambda: asyncio.run(legacy_get(f"{base_url}/api/profile/bench")), args.calls)
+    # No response caching, so every call makes a real request
+    client = APIClient(base_url=base_url, cache_ttl=0)
+    new = measure(lambda: client.get_profile("bench"), args.calls)
+    server.shutdown()
+
+    print(f"{'get_profile':<36} {'p50 ms':>8} {'p99 ms':>8}")
+    for name, samples in (
+        ("asyncio.run + new AsyncClient", old),
+        ("pooled sync Client", new),
+    ):
+        p99 = statistics.quantiles(samples, n=100)[98]
+        print(f"{name:<36} {statistics.median(samples):>8.2f} {p99:>8.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -3,90 +3,146 @@ from typing import Dict, List, Optional
 import os
 from dotenv import load_dotenv
 
+from .response_cache import ResponseCache
+
 # Load environment variables in development
 if os.getenv("APP_ENV") == "development":
     load_dotenv()
 
+# Seconds profile and matches responses are served from the session cache
+API_CACHE_TTL = float(os.getenv("API_CACHE_TTL", "60"))
+
+def create_http_client() -> httpx.Client:
+    """Create a pooled keep-alive HTTP client for the backend API."""
+    return httpx.Client(
+        timeout=30.0,
+        limits=httpx.Limits(max_connections=50, max_keepalive_connections=20)
+    )
+
 class APIClient:
-    """Client for communicating with the backend API."""
+    """Client for communicating with the backend API.
+
+    Requests are synchronous, so Streamlit scripts can call them directly
+    without building an event loop per call. Pass a shared `http_client`
+    to reuse pooled connections across sessions.
+
+    Profile and matches responses are cached for `cache_ttl` seconds per
+    user, and revalidated with their ETag once stale. Keep one client per
+    session so the cache is session-scoped.
+    """
     
-    def __init__(self, base_url: str = "http://localhost:8000"):
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8000",
+        http_client: Optional[httpx.Client] = None,
+        cache_ttl: float = API_CACHE_TTL
+    ):
         self.base_url = base_url
         self.token: Optional[str] = None
+        self.http_client = http_client or create_http_client()
+        self.cache = ResponseCache(cache_ttl)
         
-    async def _make_request(
+    def _make_request(
         self,
         method: str,
         endpoint: str,
         data: Optional[Dict] = None,
-        params: Optional[Dict] = None
+        params: Optional[Dict] = None,
+        cache_user: Optional[str] = None
     ) -> Dict:
-        """Make HTTP request to API with error handling."""
+        """Make HTTP request to API with error handling.
+
+        GET requests with a `cache_user` go through the response cache.
+        """
         headers = {"Authorization": f"Bearer {self.token}"} if self.token else {}
         
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.request(
-                    method,
-                    f"{self.base_url}{endpoint}",
-                    json=data,
-                    params=params,
-                    headers=headers,
-                    timeout=30.0
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPError as e:
-                error_msg = f"API request failed: {str(e)}"
-                if response := getattr(e, "response", None):
-                    try:
-                        error_msg = response.json().get("detail", error_msg)
-                    except:
-                        pass
-                raise APIError(error_msg)
+        cache_key = None
+        if method == "GET" and cache_user is not None:
+            cache_key = (self.token, endpoint, tuple(sorted((params or {}).items())))
+            cached = self.cache.get(cache_user, cache_key)
+            if cached:
+                if cached.fresh:
+                    return cached.body
+                if cached.etag:
+                    headers["If-None-Match"] = cached.etag
+        
+        try:
+            response = self.http_client.request(
+                method,
+                f"{self.base_url}{endpoint}",
+                json=data,
+                params=params,
+                headers=headers
+            )
+            if response.status_code == 304 and cache_key is not None:
+                return self.cache.touch(cache_user, cache_key)
+            response.raise_for_status()
+            body = response.json()
+            if cache_key is not None:
+                self.cache.put(cache_user, cache_key, body, response.headers.get("etag"))
+            return body
+        except httpx.HTTPError as e:
+            error_msg = f"API request failed: {str(e)}"
+            if response := getattr(e, "response", None):
+                try:
+                    error_msg = response.json().get("detail", error_msg)
+                except:
+                    pass
+            raise APIError(error_msg)
 
     # Chat endpoints
-    async def chat_with_advisor(self, message: str, user_id: str) -> Dict:
+    def chat_with_advisor(self, message: str, user_id: str) -> Dict:
         """Send message to chat advisor."""
-        return await self._make_request(
+        return self._make_request(
             "POST",
             "/api/chat/advisor",
             data={"message": message, "user_id": user_id, "chat_mode": "advisor"}
         )
 
-    async def chat_with_partner(self, message: str, user_id: str) -> Dict:
+    def chat_with_partner(self, message: str, user_id: str) -> Dict:
         """Send message to partner simulation."""
-        return await self._make_request(
+        return self._make_request(
             "POST",
             "/api/chat/partner",
             data={"message": message, "user_id": user_id, "chat_mode": "partner"}
         )
 
     # Profile endpoints
-    async def get_profile(self, user_id: str) -> Dict:
+    def get_profile(self, user_id: str) -> Dict:
         """Get user profile."""
-        return await self._make_request("GET", f"/api/profile/{user_id}")
+        return self._make_request("GET", f"/api/profile/{user_id}", cache_user=user_id)
 
-    async def update_profile(self, user_id: str, profile_data: Dict) -> Dict:
+    def update_profile(self, user_id: str, profile_data: Dict) -> Dict:
         """Update user profile."""
-        return await self._make_request(
+        profile = self._make_request(
             "PUT",
             f"/api/profile/{user_id}",
             data=profile_data
         )
+        # The profile and the matches computed from it are now out of date
+        self.cache.invalidate(user_id)
+        return profile
 
     # Matches endpoints
-    async def get_matches(
+    def get_matches(
         self,
         user_id: str,
         min_score: float = 50.0,
-        limit: int = 10
+        limit: int = 10,
+        min_age: Optional[int] = None,
+        max_age: Optional[int] = None,
+        location: Optional[str] = None
     ) -> List[Dict]:
-        """Get potential matches for user."""
-        return await self._make_request(
+        """Get potential matches for user, optionally within an age range and location."""
+        params = {"min_score": min_score, "limit": limit}
+        for name, value in (("min_age", min_age), ("max_age", max_age), ("location", location)):
+            if value is not None:
+                params[name] = value
+        return self._make_request(
             "GET",
             f"/api/matches/{user_id}",
-            params={"min_score": min_score, "limit": limit}
+            params=params,
+            cache_user=user_id
         )
 
 class APIError(Exception):
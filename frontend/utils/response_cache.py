@@ -0,0 +1,45 @@
+from typing import Any, Dict, Hashable, NamedTuple, Optional
+import time
+
+class CacheEntry(NamedTuple):
+    """A cached response body with its validator."""
+    body: Any
+    etag: Optional[str]
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+class ResponseCache:
+    """TTL cache of GET responses, grouped by user so they can be invalidated together.
+
+    Kept per Streamlit session on its APIClient. Fresh entries are served
+    without a request; stale entries with an ETag are revalidated with
+    If-None-Match, so an unchanged body is not downloaded again.
+    """
+
+    def __init__(self, ttl: float = 60.0):
+        self.ttl = ttl
+        self._entries: Dict[str, Dict[Hashable, CacheEntry]] = {}
+
+    def get(self, user_id: str, key: Hashable) -> Optional[CacheEntry]:
+        return self._entries.get(user_id, {}).get(key)
+
+    def put(self, user_id: str, key: Hashable, body: Any, etag: Optional[str] = None) -> None:
+        self._entries.setdefault(user_id, {})[key] = CacheEntry(
+            body, etag, time.monotonic() + self.ttl
+        )
+
+    def touch(self, user_id: str, key: Hashable) -> Any:
+        """Restart the TTL of an entry the server confirmed unchanged and return its body."""
+        entry = self._entries[user_id][key]
+        self.put(user_id, key, entry.body, entry.etag)
+        return entry.body
+
+    def invalidate(self, user_id: Optional[str] = None) -> None:
+        """Drop cached responses for one user, or for everyone."""
+        if user_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(user_id, None)
@@ -0,0 +1,177 @@
+# topic_tracker.py - Conversation topic tracking for Date Mate
+import json
+from collections import Counter, deque
+from typing import Dict, Iterable, List, Mapping, Tuple
+
+# Topic -> keywords and phrases that indicate it. Matching is
+# case-insensitive and on whole words.
+DEFAULT_TAXONOMY: Dict[str, List[str]] = {
+    "first dates": [
+        "first date", "date idea", "date ideas", "date night", "dinner date",
+        "coffee date", "where to go", "what to wear", "date"
+    ],
+    "online dating": [
+        "dating app", "dating apps", "tinder", "bumble", "hinge", "swipe",
+        "swiping", "bio", "profile", "profile picture", "photos"
+    ],
+    "matches": ["match", "matches", "matched", "compatible", "compatibility"],
+    "communication": [
+        "text", "texting", "texted", "message", "messages", "reply", "replied",
+        "call", "called", "conversation", "talk", "talking", "ghosted", "ghosting"
+    ],
+    "relationships": [
+        "relationship", "relationships", "boyfriend", "girlfriend", "partner",
+        "exclusive", "commitment", "commit", "define the relationship", "dtr"
+    ],
+    "breakups": [
+        "breakup", "break up", "broke up", "broken up", "ex", "heartbreak",
+        "heartbroken", "moving on", "get over"
+    ],
+    "attraction": ["attraction", "attracted", "chemistry", "spark", "crush", "flirt", "flirting", "kiss"],
+    "confidence": [
+        "confidence", "confident", "nervous", "anxious", "anxiety", "shy",
+        "insecure", "self-esteem", "rejection", "rejected"
+    ],
+    "red flags": [
+        "red flag", "red flags", "toxic", "jealous", "jealousy", "controlling",
+        "manipulative", "gaslighting", "disrespect", "lying", "cheating", "cheated"
+    ],
+    "family and friends": ["parents", "family", "friends", "meet the parents", "roommate"],
+    "long distance": ["long distance", "ldr", "different city", "moving away", "visit"],
+    "marriage": ["marriage", "married", "marry", "engaged", "engagement", "wedding", "propose", "proposal"],
+    "advice": ["advice", "help me", "should i", "what do i do", "tips", "suggest"],
+}
+
+def load_taxonomy(path: str) -> Dict[str, List[str]]:
+    """Load a {topic: [keywords]} taxonomy from a JSON file."""
+    with open(path, encoding="utf-8") as f:
+        taxonomy = json.load(f)
+    return {str(topic): [str(k) for k in keywords] for topic, keywords in taxonomy.items()}
+
+class TopicMatcher:
+    """Finds taxonomy keywords in a message with an Aho-Corasick automaton.
+
+    All keywords are matched in a single pass over the text, so the cost
+    per message grows with its length, not with the taxonomy size.
+    """
+
+    def __init__(self, taxonomy: Mapping[str, Iterable[str]]):
+        # Trie as parallel lists indexed by node id: transitions, failure
+        # link and (keyword length, topic) outputs
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, str]]] = [[]]
+
+        for topic, keywords in taxonomy.items():
+            for keyword in keywords:
+                keyword = keyword.lower().strip()
+                if keyword:
+                    self._add(keyword, topic)
+        self._link()
+
+    def _add(self, keyword: str, topic: str) -> None:
+        node = 0
+        for char in keyword:
+            nxt = self._goto[node].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[node][char] = nxt
+            node = nxt
+        self._out[node].append((len(keyword), topic))
+
+    def _link(self) -> None:
+        # Breadth-first, so a node's failure target is always linked first
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                # Inherit the keywords that end at the failure target
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find(self, text: str) -> Counter:
+        """Count whole-word keyword hits per topic in text."""
+        text = text.lower()
+        goto, fail, out = self._goto, self._fail, self._out
+        hits: Counter = Counter()
+        node = 0
+        end = len(text)
+        for i, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if out[node] and (i + 1 == end or not text[i + 1].isalnum()):
+                for length, topic in out[node]:
+                    start = i - length + 1
+                    if start == 0 or not text[start - 1].isalnum():
+                        hits[topic] += 1
+        return hits
+
+class TopicProfile:
+    """Exponentially decayed topic frequencies for one conversation.
+
+    Each message multiplies earlier scores by `decay`, so recent topics
+    dominate. Decay is applied lazily when a topic is touched or read,
+    which keeps updates proportional to the topics in the message.
+    """
+
+    def __init__(self, half_life: float = 6.0):
+        self.decay = 0.5 ** (1.0 / half_life)
+        self.turn = 0
+        # topic -> (score, turn it was last updated)
+        self._scores: Dict[str, Tuple[float, int]] = {}
+
+    def update(self, hits: Mapping[str, int]) -> None:
+        """Record the topics of one new message."""
+        self.turn += 1
+        for topic, count in hits.items():
+            score, turn = self._scores.get(topic, (0.0, self.turn))
+            self._scores[topic] = (score * self.decay ** (self.turn - turn) + count, self.turn)
+
+    def scores(self, min_score: float = 0.05) -> Dict[str, float]:
+        """Current decayed scores, highest first, without negligible topics."""
+        current = {
+            topic: score * self.decay ** (self.turn - turn)
+            for topic, (score, turn) in self._scores.items()
+        }
+        return dict(sorted(
+            ((topic, round(score, 3)) for topic, score in current.items() if score >= min_score),
+            key=lambda item: -item[1]
+        ))
+
+    def top(self, n: int = 5) -> List[str]:
+        return list(self.scores())[:n]
+
+def merge_scores(profiles: Iterable[TopicProfile]) -> Dict[str, float]:
+    """Sum the current scores of several topic profiles, highest first."""
+    total: Counter = Counter()
+    for profile in profiles:
+        total.update(profile.scores())
+    return dict(sorted(((topic, round(score, 3)) for topic, score in total.items()), key=lambda item: -item[1]))
+
+def update_context(
+    context: Dict,
+    matcher: TopicMatcher,
+    profile: TopicProfile,
+    message: str,
+    max_topics: int = 5,
+    others: Iterable[TopicProfile] = ()
+) -> Counter:
+    """Track the topics of a message and publish them in a conversation context.
+
+    When several conversations share one context, pass their profiles as
+    `others`, so the published topics cover all of them.
+    """
+    hits = matcher.find(message)
+    profile.update(hits)
+    context["topic_scores"] = merge_scores([profile, *others])
+    context["recent_topics"] = list(context["topic_scores"])[:max_topics]
+    return hits